@@ -6,6 +6,7 @@ Provides the abstract interface and registry for instrument handlers.
 
 from __future__ import annotations
 
+import math
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Optional, Type
@@ -13,7 +14,7 @@ from typing import Optional, Type
 from assembler.parsers.parquet_parser import ParquetData
 
 
-@dataclass
+@dataclass(slots=True)
 class InstrumentDefaults:
     """Default values for an instrument."""
 
@@ -115,8 +116,6 @@ class Instrument(ABC):
             if name in parquet.daslogs:
                 log = parquet.daslogs[name]
                 if prefer_average and log.average_value is not None:
-                    import math
-
                     if not math.isnan(log.average_value):
                         return log.average_value
                 if log.value_numeric is not None:
@@ -133,6 +132,8 @@ class InstrumentRegistry:
     """
 
     _handlers: dict[str, Type[Instrument]] = {}
+    # Resolved handler per instrument id, including pattern/generic fallbacks
+    _resolved: dict[str, Type[Instrument]] = {}
 
     @classmethod
     def register(cls, handler: Type[Instrument]) -> Type[Instrument]:
@@ -153,6 +154,8 @@ class InstrumentRegistry:
         cls._handlers[handler.name] = handler
         for alias in handler.aliases:
             cls._handlers[alias] = handler
+        # A new handler can change how previously seen ids resolve
+        cls._resolved.clear()
         return handler
 
     @classmethod
@@ -160,6 +163,9 @@ class InstrumentRegistry:
         """
         Get the appropriate handler for an instrument.
 
+        Resolutions are cached per instrument id, so the pattern-matching
+        fallback runs once per id rather than once per record.
+
         Args:
             instrument_id: Instrument identifier string
 
@@ -169,6 +175,14 @@ class InstrumentRegistry:
         if not instrument_id:
             return GenericInstrument
 
+        handler = cls._resolved.get(instrument_id)
+        if handler is None:
+            handler = cls._resolved[instrument_id] = cls._resolve_handler(instrument_id)
+        return handler
+
+    @classmethod
+    def _resolve_handler(cls, instrument_id: str) -> Type[Instrument]:
+        """Look up the handler for an instrument id without the cache."""
         # First check direct match
         if instrument_id in cls._handlers:
             return cls._handlers[instrument_id]
@@ -7,11 +7,34 @@ extracting layer structures, materials, and fit parameters.
 
 import json
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional
 
+import numpy as np
 
-@dataclass
+try:  # Optional fast JSON decoder (``pip install data-assembler[fast]``)
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _loads_json(buf: bytes) -> Any:
+    """
+    Decode a JSON document, using orjson when it is installed.
+
+    orjson rejects the non-standard ``NaN``/``Infinity`` literals that bumps
+    may write, so those documents fall back to the stdlib decoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(buf)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(buf)
+
+
+@dataclass(slots=True)
 class ModelMaterial:
     """Material from a refl1d model."""
 
@@ -121,7 +144,7 @@ class ModelMaterial:
         return 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelLayer:
     """Layer from a refl1d model."""
 
@@ -172,7 +195,10 @@ class ModelData:
     # File info
     file_path: str
 
-    # Layer stack (top to bottom)
+    # Layer stack (top to bottom), backed by the ``layers`` property below.
+    # The property replaces this default, so the generated __init__ passes the
+    # property object itself when no layers are given; the setter maps that
+    # to a new empty list.
     layers: list[ModelLayer] = field(default_factory=list)
 
     # Raw JSON dict for the full model (for reproducibility)
@@ -184,6 +210,51 @@ class ModelData:
     # Companion error data (from -err.json), keyed by parameter name
     error_data: Optional[dict[str, Any]] = None
 
+    # Built layer stack, or None while the raw layer dicts are still pending
+    _layers: Optional[list[ModelLayer]] = field(init=False, repr=False, compare=False)
+
+    # Unparsed layer dicts and parameter references awaiting materialization
+    _raw_layers: Optional[list[dict]] = field(default=None, init=False, repr=False, compare=False)
+    _references: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+
+    # Probe (Q, R) arrays per experiment, built on first use from raw_json
+    _probe_arrays: dict[int, tuple[np.ndarray, np.ndarray]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @property  # type: ignore[no-redef]
+    def layers(self) -> list[ModelLayer]:
+        """
+        Layer stack (top to bottom).
+
+        ``ModelParser.parse_dict`` only records the raw layer dicts; the
+        ModelLayer/ModelMaterial objects are built on first access, so
+        callers that only need ``num_datasets`` or the probe data never pay
+        for them.
+        """
+        if self._layers is None:
+            references = self._references or {}
+            self._layers = [
+                ModelLayer.from_json(layer_data, references, self.error_data)
+                for layer_data in self._raw_layers or []
+            ]
+            self._raw_layers = None
+        return self._layers
+
+    @layers.setter
+    def layers(self, value: list[ModelLayer]) -> None:
+        # A new stack replaces any deferred one and what was derived from it
+        self._layers = [] if isinstance(value, property) else value
+        self._raw_layers = None
+        self._invalidate()
+
+    def _defer_layers(self, raw_layers: list[dict], references: dict) -> None:
+        """Replace the layer stack with raw layer dicts built on first access."""
+        self._layers = None
+        self._raw_layers = raw_layers
+        self._references = references
+        self._invalidate()
+
     @property
     def num_layers(self) -> int:
         """Number of layers in the stack."""
@@ -197,7 +268,16 @@ class ModelData:
             return len(obj.get("models", []))
         return 0
 
-    @property
+    # Derived views of the layer stack are cached; assigning ``layers``
+    # (e.g. via select_dataset) clears them.
+    _DERIVED = ("substrate", "ambient", "film_layers", "total_thickness")
+
+    def _invalidate(self) -> None:
+        """Drop cached values derived from the layer stack."""
+        for name in self._DERIVED:
+            self.__dict__.pop(name, None)
+
+    @cached_property
     def substrate(self) -> Optional[ModelLayer]:
         """Get the substrate layer (last in stack with zero thickness)."""
         if self.layers:
@@ -206,7 +286,7 @@ class ModelData:
                 return last
         return None
 
-    @property
+    @cached_property
     def ambient(self) -> Optional[ModelLayer]:
         """Get the ambient layer (first in stack with zero thickness)."""
         if self.layers:
@@ -215,12 +295,12 @@ class ModelData:
                 return first
         return None
 
-    @property
+    @cached_property
     def film_layers(self) -> list[ModelLayer]:
         """Get film layers (non-zero thickness)."""
         return [l for l in self.layers if l.thickness > 0]
 
-    @property
+    @cached_property
     def total_thickness(self) -> float:
         """Total film thickness."""
         return sum(l.thickness for l in self.film_layers)
@@ -328,6 +408,33 @@ class ModelData:
             return r_data.get("values", [])
         return []
 
+    def get_probe_arrays(self, index: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get an experiment's probe Q and R as float64 arrays.
+
+        Q is always returned in ascending order, so its first and last
+        values are the Q range; an unsorted grid is reordered (R follows Q
+        when the lengths match). The arrays are built once per experiment
+        and cached, so treat them as read-only.
+
+        Args:
+            index: 0-based experiment index
+
+        Returns:
+            Tuple of (Q, R) arrays; empty arrays if unavailable
+        """
+        arrays = self._probe_arrays.get(index)
+        if arrays is None:
+            q = np.asarray(self.get_probe_q(index), dtype=np.float64)
+            r = np.asarray(self.get_probe_r(index), dtype=np.float64)
+            if len(q) >= 2 and (np.diff(q) < 0).any():
+                order = np.argsort(q, kind="stable")
+                q = q[order]
+                if len(r) == len(order):
+                    r = r[order]
+            arrays = self._probe_arrays[index] = (q, r)
+        return arrays
+
 
 class ModelParser:
     """
@@ -375,19 +482,19 @@ class ModelParser:
         """
         file_path = Path(file_path)
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        try:
+            with open(file_path, "rb") as f:
+                data = _loads_json(f.read())
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
 
         # Load fit uncertainties: explicit err_path if given, else the companion
         # error file (<name>-err.json) next to the model.
         error_data = None
         resolved_err = Path(err_path) if err_path else file_path.with_name(file_path.stem + "-err.json")
         if resolved_err.exists():
-            with open(resolved_err, "r") as f:
-                error_data = json.load(f)
+            with open(resolved_err, "rb") as f:
+                error_data = _loads_json(f.read())
 
         return self.parse_dict(
             data, str(file_path), raw_json=data,
@@ -445,11 +552,8 @@ class ModelParser:
                 if models_list:
                     sample = models_list[0].get("sample") or {}
 
-        # Parse layers
-        layers_data = sample.get("layers", [])
-        for layer_data in layers_data:
-            layer = ModelLayer.from_json(layer_data, references, error_data)
-            result.layers.append(layer)
+        # Defer layer construction until ``result.layers`` is first accessed
+        result._defer_layers(sample.get("layers", []), references)
 
         return result
 
@@ -9,9 +9,10 @@ Reads and interprets parquet files generated by nexus-processor:
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-import pyarrow.parquet as pq
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass
@@ -164,8 +165,7 @@ class ParquetParser:
         Returns:
             MetadataRecord or None if not found
         """
-        table = pq.read_table(file_path)
-        df = table.to_pandas()
+        df = _read_frame(file_path)
 
         if run_number is not None:
             df = df[df["run_number"] == run_number]
@@ -191,8 +191,7 @@ class ParquetParser:
         run_number: Optional[int] = None,
     ) -> Optional[SampleRecord]:
         """Parse sample.parquet file."""
-        table = pq.read_table(file_path)
-        df = table.to_pandas()
+        df = _read_frame(file_path)
 
         if run_number is not None:
             df = df[df["run_number"] == run_number]
@@ -219,8 +218,7 @@ class ParquetParser:
         Returns a dictionary mapping log_name to the aggregated log record
         (uses the first record for each log_name, which contains averages).
         """
-        table = pq.read_table(file_path)
-        df = table.to_pandas()
+        df = _read_frame(file_path)
 
         if run_number is not None:
             df = df[df["run_number"] == run_number]
@@ -260,6 +258,18 @@ class ParquetParser:
         return value
 
 
+def _read_frame(file_path: str | Path) -> "pd.DataFrame":
+    """Read a parquet file into a DataFrame.
+
+    pyarrow.parquet is imported here rather than at module level, so the
+    data classes above can be imported (e.g. by the assembler and the
+    instrument handlers) without loading pyarrow.
+    """
+    import pyarrow.parquet as pq
+
+    return pq.read_table(file_path).to_pandas()
+
+
 def find_parquet_files(
     base_dir: str | Path,
     run_number: int,
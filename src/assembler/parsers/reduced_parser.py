@@ -5,20 +5,24 @@ Parses the text file format output by the SNS reduction software,
 extracting header metadata and Q/R/dR/dQ data columns.
 """
 
+import copy
+import functools
 import json
 import logging
+import os
 import re
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+import numpy as np
 from dateutil import parser as date_parser
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ReductionRun:
     """Information about a single data run in the reduction."""
 
@@ -64,8 +68,10 @@ class ReducedData:
     @property
     def q_range(self) -> tuple[float, float]:
         """Q range (min, max)."""
-        if not self.q:
+        if len(self.q) == 0:
             return (0.0, 0.0)
+        if isinstance(self.q, np.ndarray):
+            return (float(self.q.min()), float(self.q.max()))
         return (min(self.q), max(self.q))
 
     @property
@@ -93,22 +99,14 @@ class ReducedParser:
         print(f"Q range: {data.q_range}")
     """
 
-    # Regex patterns for header parsing
-    # Note: patterns with $ need MULTILINE to match end-of-line, not just end-of-string
+    # Regex patterns for header lines that are not of the "Key: value" form
     PATTERNS = {
         "experiment": re.compile(r"Experiment\s+(IPTS-\d+)\s+Run\s+(\d+)", re.IGNORECASE),
-        "reduction": re.compile(r"Reduction\s+(.+)$", re.IGNORECASE | re.MULTILINE),
-        "run_title": re.compile(r"Run title:\s*(.+)$", re.IGNORECASE | re.MULTILINE),
-        "run_start": re.compile(r"Run start time:\s*(.+)$", re.IGNORECASE | re.MULTILINE),
-        "reduction_time": re.compile(r"Reduction time:\s*(.+)$", re.IGNORECASE | re.MULTILINE),
-        "meta": re.compile(r"^Meta\s*:\s*(\{.*)$", re.IGNORECASE | re.MULTILINE),
+        "reduction": re.compile(r"Reduction\s+(.+)$", re.IGNORECASE),
     }
 
     # Pattern for run info table - extracts two_theta (3rd column)
-    RUN_TABLE_PATTERN = re.compile(
-        r"^\s*\d+\s+\d+\s+([\d.eE+-]+)",
-        re.MULTILINE,
-    )
+    RUN_TABLE_PATTERN = re.compile(r"\s*\d+\s+\d+\s+([\d.eE+-]+)")
 
     def __init__(self):
         """Initialize the parser."""
@@ -130,13 +128,23 @@ class ReducedParser:
         """
         file_path = Path(file_path)
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        with open(file_path, "r") as f:
-            content = f.read()
-
-        return self.parse_content(content, str(file_path))
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+
+        cached = _parse_cached(type(self), str(file_path), stat.st_mtime_ns, stat.st_size)
+        # Fresh copies of every mutable member so callers can't mutate the
+        # cached parse
+        return replace(
+            cached,
+            runs=[replace(run) for run in cached.runs],
+            meta=copy.deepcopy(cached.meta),
+            q=list(cached.q),
+            r=list(cached.r),
+            dr=list(cached.dr),
+            dq=list(cached.dq),
+        )
 
     def parse_content(self, content: str, file_path: str = "") -> ReducedData:
         """
@@ -179,59 +187,85 @@ class ReducedParser:
         return result
 
     def _parse_header(self, header_lines: list[str], result: ReducedData) -> None:
-        """Parse header comment lines."""
-        full_header = "\n".join(header_lines)
+        """Parse header comment lines.
 
-        # Extract experiment ID and run number
-        match = self.PATTERNS["experiment"].search(full_header)
+        Lines are scanned once: ``Key: value`` lines are indexed by their
+        lower-cased key (first occurrence wins), the remaining lines are
+        checked for the reduction version and run table.
+        """
+        # Experiment and run number may be split across lines
+        # ("Experiment IPTS-N" / "Run M"), so search the joined header
+        match = self.PATTERNS["experiment"].search("\n".join(header_lines))
         if match:
             result.experiment_id = match.group(1)
             result.run_number = int(match.group(2))
 
-        # Extract reduction version
-        match = self.PATTERNS["reduction"].search(full_header)
-        if match:
-            result.reduction_version = match.group(1).strip()
+        fields: dict[str, str] = {}
 
-        # Extract run title
-        match = self.PATTERNS["run_title"].search(full_header)
-        if match:
-            result.run_title = match.group(1).strip()
+        for line in header_lines:
+            key, sep, value = line.partition(":")
+            if sep:
+                fields.setdefault(key.strip().lower(), value.strip())
+                continue
 
-        # Extract run start time
-        match = self.PATTERNS["run_start"].search(full_header)
-        if match:
+            if result.reduction_version is None:
+                match = self.PATTERNS["reduction"].match(line)
+                if match:
+                    result.reduction_version = match.group(1).strip()
+                    continue
+
+            # Run info table (two_theta values)
+            match = self.RUN_TABLE_PATTERN.match(line)
+            if match:
+                result.runs.append(ReductionRun(two_theta=float(match.group(1))))
+
+        if "run title" in fields:
+            result.run_title = fields["run title"]
+
+        if "run start time" in fields:
             try:
-                result.run_start_time = date_parser.parse(match.group(1).strip())
+                result.run_start_time = date_parser.parse(fields["run start time"])
             except (ValueError, TypeError):
                 pass
 
-        # Extract reduction time
-        match = self.PATTERNS["reduction_time"].search(full_header)
-        if match:
+        if "reduction time" in fields:
             try:
-                result.reduction_time = date_parser.parse(match.group(1).strip())
+                result.reduction_time = date_parser.parse(fields["reduction time"])
             except (ValueError, TypeError):
                 pass
 
-        # Extract optional Meta JSON block
-        match = self.PATTERNS["meta"].search(full_header)
-        if match:
+        # Optional Meta JSON block
+        meta = fields.get("meta")
+        if meta and meta.startswith("{"):
             try:
-                result.meta = json.loads(match.group(1).strip())
+                result.meta = json.loads(meta)
             except json.JSONDecodeError as e:
                 logger.warning("Could not parse Meta JSON in reduced header: %s", e)
 
-        # Extract run info table (two_theta values)
-        for match in self.RUN_TABLE_PATTERN.finditer(full_header):
-            result.runs.append(
-                ReductionRun(
-                    two_theta=float(match.group(1)),
-                )
+    def _parse_data(self, data_lines: list[str], result: ReducedData) -> None:
+        """Parse data columns.
+
+        Well-formed files are tokenized in one vectorized pass; files with
+        short or malformed rows fall back to the tolerant line-by-line parser.
+        """
+        if not data_lines:
+            return
+
+        try:
+            columns = np.loadtxt(
+                data_lines, dtype=np.float64, comments=None, usecols=(0, 1, 2, 3), ndmin=2
             )
+        except ValueError:
+            self._parse_data_lines(data_lines, result)
+            return
 
-    def _parse_data(self, data_lines: list[str], result: ReducedData) -> None:
-        """Parse data columns."""
+        result.q = columns[:, 0].tolist()
+        result.r = columns[:, 1].tolist()
+        result.dr = columns[:, 2].tolist()
+        result.dq = columns[:, 3].tolist()
+
+    def _parse_data_lines(self, data_lines: list[str], result: ReducedData) -> None:
+        """Parse data columns line by line, skipping malformed lines."""
         for line in data_lines:
             parts = line.split()
 
@@ -253,6 +287,22 @@ class ReducedParser:
                 continue
 
 
+@functools.lru_cache(maxsize=64)
+def _parse_cached(
+    parser_cls: type[ReducedParser], path: str, mtime_ns: int, size: int
+) -> ReducedData:
+    """
+    Parse a reduced file, memoized on its path, mtime and size.
+
+    The parser class is part of the key and does the parsing, so subclasses
+    that override parse_content() get their own entries.
+    """
+    with open(path, "r") as f:
+        content = f.read()
+
+    return parser_cls().parse_content(content, path)
+
+
 def extract_run_number_from_filename(filename: str) -> Optional[int]:
     """
     Extract run number from a reduced data filename.
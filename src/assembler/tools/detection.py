@@ -5,7 +5,9 @@ Functions for detecting file types and extracting identifiers
 (run numbers, IPTS, instrument) from file paths and content.
 """
 
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -24,13 +26,68 @@ PATTERNS = {
     "instrument_ref_l": re.compile(r"REF[_-]?L", re.IGNORECASE),
 }
 
+# Direct references to the compiled patterns used on every detected file
+_RE_GENERIC = PATTERNS["run_from_generic"]
+_RE_IPTS_PATH = PATTERNS["ipts_from_path"]
+_RE_IPTS_CONTENT = PATTERNS["ipts_from_content"]
+_RE_INSTRUMENT = PATTERNS["instrument_ref_l"]
+
+_RE_REFL = PATTERNS["run_from_refl_filename"]
+_RE_REF_L = PATTERNS["run_from_ref_l_filename"]
+
+# The three run-number patterns fused into one scan. The leftmost match is
+# only final when no higher-precedence token (REFL_ > REF_L_ > generic)
+# follows it.
+_RE_RUN_COMBINED = re.compile(
+    r"REFL_(?P<refl>\d+)|REF_L_(?P<ref_l>\d+)|[_-](?P<generic>\d{5,7})[_.-]",
+    re.IGNORECASE,
+)
+
+# Extensions that determine the file type on their own (covers ``.nxs.h5``)
+_SUFFIX_MAP = {
+    ".parquet": FileType.PARQUET,
+    ".h5": FileType.RAW_HDF5,
+    ".hdf5": FileType.RAW_HDF5,
+}
+
+
+def detect_file_type_by_name(name: str) -> Optional[FileType]:
+    """
+    Classify a file from its name alone, without touching the filesystem.
+
+    Args:
+        name: File name (or path)
+
+    Returns:
+        The FileType when the extension decides it, FileType.UNKNOWN for
+        unsupported extensions, or None when the content must be sniffed
+        (JSON, TXT).
+
+    Example:
+        >>> detect_file_type_by_name("metadata_218386.parquet")
+        FileType.PARQUET
+        >>> detect_file_type_by_name("model_218386.json") is None
+        True
+    """
+    suffix = os.path.splitext(name)[1].lower()
+
+    file_type = _SUFFIX_MAP.get(suffix)
+    if file_type is not None:
+        return file_type
+    if suffix in _CONTENT_SNIFFERS:
+        return None
+    return FileType.UNKNOWN
+
 
 def detect_file_type(file_path: str | Path) -> FileType:
     """
     Detect the type of a data file based on extension and content.
 
     Examines file extension first, then content for ambiguous types
-    (JSON, TXT).
+    (JSON, TXT). The file is not stat'ed up front: callers are expected to
+    pass an existing file (e.g. from a directory listing). Extension-typed
+    paths are classified by name alone; content-sniffed types report
+    UNKNOWN when the file cannot be read.
 
     Args:
         file_path: Path to the file
@@ -44,73 +101,140 @@ def detect_file_type(file_path: str | Path) -> FileType:
         >>> detect_file_type("/data/metadata.parquet")
         FileType.PARQUET
     """
-    path = Path(file_path)
-
-    if not path.exists():
-        return FileType.UNKNOWN
-
-    suffix = path.suffix.lower()
-    name = path.name.lower()
+    name = os.path.basename(os.fspath(file_path))
 
     # Check by extension
-    if suffix == ".parquet":
-        return FileType.PARQUET
-    elif suffix in (".h5", ".hdf5") or name.endswith(".nxs.h5"):
-        return FileType.RAW_HDF5
-    elif suffix == ".json":
-        return _detect_json_type(path)
-    elif suffix == ".txt":
-        return _detect_text_type(path)
+    file_type = detect_file_type_by_name(name)
+    if file_type is not None:
+        return file_type
 
-    return FileType.UNKNOWN
+    return _CONTENT_SNIFFERS[os.path.splitext(name)[1].lower()](Path(file_path))
 
 
 def _detect_json_type(path: Path) -> FileType:
-    """Detect if a JSON file is a refl1d model."""
+    """Detect if a JSON file is a refl1d model.
+
+    The indicators are ASCII, so the head of the file is checked as raw
+    bytes without decoding it.
+    """
     try:
         # Read first few KB to check for model indicators
-        with open(path, "r") as f:
+        with open(path, "rb") as f:
             content = f.read(4096)
+    except OSError:
+        return FileType.UNKNOWN
 
-        # Look for bumps/refl1d indicators
-        if '"$schema"' in content and "bumps" in content.lower():
-            return FileType.MODEL
-        if '"sample"' in content and '"layers"' in content:
-            return FileType.MODEL
-        if "refl1d" in content.lower():
-            return FileType.MODEL
-
-    except Exception:
-        pass
+    # Look for bumps/refl1d indicators
+    lowered = content.lower()
+    if b'"$schema"' in content and b"bumps" in lowered:
+        return FileType.MODEL
+    if b'"sample"' in content and b'"layers"' in content:
+        return FileType.MODEL
+    if b"refl1d" in lowered:
+        return FileType.MODEL
 
     return FileType.UNKNOWN
 
 
+def _reduced_name_hits(name: str) -> int:
+    """Count the reduced-data indicators (``combined_data``, ``REFL_``) in a file name."""
+    upper = name.upper()
+    return ("COMBINED_DATA" in upper) + ("REFL_" in upper)
+
+
 def _detect_text_type(path: Path) -> FileType:
-    """Detect if a text file is reduced reflectivity data."""
-    try:
-        with open(path, "r") as f:
-            lines = [f.readline() for _ in range(20)]
-            content = "".join(lines)
+    """Detect if a text file is reduced reflectivity data.
 
-        # Look for reduced data indicators
-        indicators = [
-            "# Experiment" in content or "# IPTS" in content,
-            "Q [1/Angstrom]" in content or "Q(1/A)" in content.replace(" ", ""),
-            "Reduction" in content,
-            "combined_data" in path.name.lower(),
-            "REFL_" in path.name.upper(),
-        ]
+    Needs at least two indicators. File-name indicators are checked first,
+    so content is only read when they are not conclusive; content checks
+    run on the raw bytes of the first 20 lines and stop at the second hit.
+    """
+    hits = _reduced_name_hits(path.name)
+    if hits >= 2:
+        return FileType.REDUCED
+
+    try:
+        with open(path, "rb") as f:
+            head = f.read(8192)
+    except OSError:
+        return FileType.UNKNOWN
+    head = b"\n".join(head.split(b"\n", 20)[:20])
 
-        if sum(indicators) >= 2:
-            return FileType.REDUCED
+    if b"# Experiment" in head or b"# IPTS" in head:
+        hits += 1
+    if hits < 2 and b"Reduction" in head:
+        hits += 1
+    if hits < 2 and (b"Q [1/Angstrom]" in head or b"Q(1/A)" in head.replace(b" ", b"")):
+        hits += 1
 
-    except Exception:
-        pass
+    if hits >= 2:
+        return FileType.REDUCED
 
     return FileType.UNKNOWN
 
 
+# Extensions whose type has to be sniffed from the file content
+_CONTENT_SNIFFERS = {
+    ".json": _detect_json_type,
+    ".txt": _detect_text_type,
+}
+
+
+# Every extension detect_file_type can classify as something other than UNKNOWN
+DATA_FILE_SUFFIXES = tuple(_SUFFIX_MAP) + tuple(_CONTENT_SNIFFERS)
+
+
+def _run_number_from_name(name: str) -> Optional[int]:
+    """Extract a run number from a bare file name."""
+    match = _RE_RUN_COMBINED.search(name)
+    if match is None:
+        return None
+
+    # Nothing of higher precedence can start before the leftmost match, so
+    # only the rest of the name needs searching for it
+    kind = match.lastgroup
+    if kind != "refl":
+        refl = _RE_REFL.search(name, match.end())
+        if refl:
+            return int(refl.group(1))
+        if kind == "generic":
+            ref_l = _RE_REF_L.search(name, match.end())
+            if ref_l:
+                return int(ref_l.group(1))
+    return int(match.group(kind))
+
+
+def classify_by_name(name: str) -> tuple[Optional[FileType], Optional[int]]:
+    """
+    Classify a file and extract its run number from the file name alone.
+
+    Extension-typed files are classified directly. A ``.txt`` file is taken
+    as reduced data without opening it only when its name alone carries both
+    reduced-data indicators (``REFL_`` and ``combined_data``), which is
+    already enough for :func:`detect_file_type`; otherwise its content
+    decides.
+
+    Args:
+        name: File name
+
+    Returns:
+        Tuple of (file type, run number). The file type is None when it can
+        only be decided from the file content; the run number is None when
+        the name does not contain one.
+
+    Example:
+        >>> classify_by_name("REFL_218386_combined_data.txt")
+        (FileType.REDUCED, 218386)
+        >>> classify_by_name("REFL_218386_notes.txt")
+        (None, 218386)
+    """
+    file_type = detect_file_type_by_name(name)
+    if file_type is None and name.lower().endswith(".txt") and _reduced_name_hits(name) >= 2:
+        file_type = FileType.REDUCED
+
+    return file_type, _run_number_from_name(name)
+
+
 def extract_run_number(file_path: str | Path) -> Optional[int]:
     """
     Extract run number from a file path or name.
@@ -131,25 +255,27 @@ def extract_run_number(file_path: str | Path) -> Optional[int]:
         218386
     """
     path = Path(file_path)
-    name = path.name
 
-    # Try specific patterns first
-    for pattern_name in ["run_from_refl_filename", "run_from_ref_l_filename"]:
-        match = PATTERNS[pattern_name].search(name)
+    # Every pattern needs digits, so skip the regex scans where there are none
+    if _has_digit(path.name):
+        run_number = _run_number_from_name(path.name)
+        if run_number is not None:
+            return run_number
+
+    # Try in the parent directories; a match never spans a path separator,
+    # so the file name itself has nothing more to offer
+    parent = str(path.parent)
+    if _has_digit(parent):
+        match = _RE_GENERIC.search(parent)
         if match:
             return int(match.group(1))
 
-    # Try generic pattern
-    match = PATTERNS["run_from_generic"].search(name)
-    if match:
-        return int(match.group(1))
+    return None
 
-    # Try in full path
-    match = PATTERNS["run_from_generic"].search(str(path))
-    if match:
-        return int(match.group(1))
 
-    return None
+def _has_digit(text: str) -> bool:
+    """Check whether a string contains any decimal digit."""
+    return any(map(str.isdigit, text))
 
 
 def extract_ipts(file_path: str | Path, content: Optional[str] = None) -> Optional[str]:
@@ -170,13 +296,14 @@ def extract_ipts(file_path: str | Path, content: Optional[str] = None) -> Option
     path_str = str(file_path)
 
     # Try from path first
-    match = PATTERNS["ipts_from_path"].search(path_str)
-    if match:
-        return match.group(1).upper()
+    if "IPTS" in path_str.upper():
+        match = _RE_IPTS_PATH.search(path_str)
+        if match:
+            return match.group(1).upper()
 
     # Try from content if provided
     if content:
-        match = PATTERNS["ipts_from_content"].search(content)
+        match = _RE_IPTS_CONTENT.search(content)
         if match:
             return f"IPTS-{match.group(1)}"
 
@@ -199,7 +326,7 @@ def extract_instrument(file_path: str | Path) -> Optional[str]:
     """
     path_str = str(file_path)
 
-    if PATTERNS["instrument_ref_l"].search(path_str):
+    if _RE_INSTRUMENT.search(path_str):
         return "REF_L"
 
     return None
@@ -210,7 +337,10 @@ def detect_file(file_path: str | Path) -> FileInfo:
     Detect file type and extract all available identifiers.
 
     This is the main entry point for file detection. It combines
-    type detection with identifier extraction.
+    type detection with identifier extraction. Results are cached on the
+    file's path, mtime and size, so repeated calls for an unchanged file
+    don't re-open it; treat the returned FileInfo as read-only. Call
+    :func:`clear_detection_cache` to drop the cache.
 
     Args:
         file_path: Path to the file
@@ -226,7 +356,29 @@ def detect_file(file_path: str | Path) -> FileInfo:
         218386
     """
     path = Path(file_path)
+    absolute = str(path.absolute())
+
+    try:
+        stat = os.stat(absolute)
+    except OSError:
+        return _detect_file(path, absolute)
+
+    return _detect_file_cached(str(path), absolute, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4096)
+def _detect_file_cached(path: str, absolute: str, mtime_ns: int, size: int) -> FileInfo:
+    """Memoized :func:`_detect_file`, keyed on the file's stat."""
+    return _detect_file(Path(path), absolute)
+
+
+def clear_detection_cache() -> None:
+    """Drop all cached :func:`detect_file` results."""
+    _detect_file_cached.cache_clear()
+
 
+def _detect_file(path: Path, absolute: str) -> FileInfo:
+    """Detect file type and identifiers without caching."""
     file_type = detect_file_type(path)
     run_number = extract_run_number(path)
     ipts = extract_ipts(path)
@@ -235,14 +387,15 @@ def detect_file(file_path: str | Path) -> FileInfo:
     # For reduced files, try to get IPTS from content
     if file_type == FileType.REDUCED and ipts is None:
         try:
-            with open(path, "r") as f:
+            with open(path, "rb") as f:
                 content = f.read(2048)
-            ipts = extract_ipts(path, content)
-        except Exception:
-            pass
+        except OSError:
+            content = b""
+        # The IPTS pattern is ASCII; latin-1 decodes any byte without failing
+        ipts = extract_ipts(path, content.decode("latin-1"))
 
     return FileInfo(
-        path=str(path.absolute()),
+        path=absolute,
         file_type=file_type,
         run_number=run_number,
         ipts=ipts,
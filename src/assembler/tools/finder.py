@@ -5,12 +5,41 @@ Provides the FileFinder class for discovering all files related
 to a specific run number.
 """
 
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-
-from .detection import detect_file
+from typing import Collection, Iterable, Iterator, Optional
+
+from .detection import (
+    DATA_FILE_SUFFIXES,
+    classify_by_name,
+    detect_file,
+    extract_run_number,
+)
 from .types import FileInfo, FileType, RelatedFiles
 
+# Maximum number of directory listings kept per FileFinder
+_DIR_CACHE_MAX = 4096
+
+# RelatedFiles slot for each file type that is assigned by type alone
+_TYPE_SLOT = {
+    FileType.REDUCED: "reduced_file",
+    FileType.RAW_HDF5: "raw_file",
+    FileType.MODEL: "model_file",
+}
+
+# Parquet slots keyed by the name fragment that selects them, in priority order
+_PARQUET_SLOT = {
+    "metadata": "metadata_parquet",
+    "sample": "sample_parquet",
+    "user": "users_parquet",
+    "daslog": "daslogs_parquet",
+    "instrument": "instrument_parquet",
+}
+_PARQUET_RE = re.compile("|".join(_PARQUET_SLOT))
+
 
 class FileFinder:
     """
@@ -37,6 +66,10 @@ class FileFinder:
             search_paths: List of directories to search for related files
         """
         self.search_paths = [Path(p) for p in search_paths]
+        # Directory listings keyed by path: (mtime, subdirectory names, file names)
+        self._dir_cache: dict[str, tuple[int, list[str], list[str]]] = {}
+        # Search roots are scanned on worker threads that share the cache
+        self._dir_cache_lock = threading.Lock()
 
     def find_related_files(
         self,
@@ -58,78 +91,227 @@ class FileFinder:
         Returns:
             RelatedFiles with paths to discovered files
         """
-        related = RelatedFiles(run_number=run_number, ipts=ipts)
-        run_str = str(run_number)
+        return self.find_related_files_batch([run_number], ipts=ipts, recursive=recursive)[
+            run_number
+        ]
+
+    def find_related_files_batch(
+        self,
+        run_numbers: Iterable[int],
+        ipts: Optional[str] = None,
+        recursive: bool = True,
+    ) -> dict[int, RelatedFiles]:
+        """
+        Find related files for several runs with a single walk of each path.
+
+        File names are matched against all requested run numbers at once,
+        so the cost of traversing the search paths is shared by every run.
+
+        Args:
+            run_numbers: The run numbers to search for
+            ipts: Optional IPTS to help narrow search
+            recursive: Whether to search subdirectories (default True)
+
+        Returns:
+            Dict mapping each run number to its RelatedFiles
+        """
+        related = {run: RelatedFiles(run_number=run, ipts=ipts) for run in run_numbers}
+        if not related:
+            return related
+
+        pattern = re.compile("|".join(re.escape(str(run)) for run in related))
+
+        def scan(search_path: Path) -> list[FileInfo]:
+            return self._scan_one_path(search_path, related.keys(), pattern, recursive)
+
+        # Roots are walked concurrently (the walk is I/O-bound and releases
+        # the GIL); results are merged here in search-path order so the
+        # first match per slot is the same as a serial scan.
+        if len(self.search_paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(self.search_paths))) as executor:
+                results = list(executor.map(scan, self.search_paths))
+        else:
+            results = [scan(search_path) for search_path in self.search_paths]
+
+        for file_infos in results:
+            for file_info in file_infos:
+                self._assign_file(related[file_info.run_number], file_info)
+
+        return related
+
+    def _scan_one_path(
+        self,
+        search_path: Path,
+        run_numbers: Collection[int],
+        pattern: re.Pattern,
+        recursive: bool,
+    ) -> list[FileInfo]:
+        """
+        Collect the files for the requested runs under a single search root.
+
+        Args:
+            search_path: Search root directory
+            run_numbers: The run numbers to search for
+            pattern: Regex matching any of the run numbers in a file name
+            recursive: Whether to search subdirectories
+
+        Returns:
+            FileInfo for each matching file, in traversal order
+        """
+        found = []
+
+        for path in self._iter_candidates(search_path, pattern, recursive):
+            name = os.path.basename(path)
+            file_type, file_run = classify_by_name(name)
+            if file_run is None:
+                # The run number may only appear in a parent directory
+                file_run = extract_run_number(path)
+
+            # Verify the run number matches one that the file name contains
+            if file_run not in run_numbers or str(file_run) not in name:
+                continue
 
-        for search_path in self.search_paths:
-            if not search_path.exists():
+            # Only open the file when the name can't decide its type
+            if file_type is None:
+                file_type = detect_file(path).file_type
+            if file_type == FileType.UNKNOWN:
                 continue
 
-            # Get files to check
+            found.append(
+                FileInfo(
+                    path=os.path.abspath(path),
+                    file_type=file_type,
+                    run_number=file_run,
+                )
+            )
+
+        return found
+
+    def _iter_candidates(
+        self,
+        root: Path,
+        pattern: re.Pattern,
+        recursive: bool = True,
+    ) -> Iterator[str]:
+        """
+        Yield data files under a search root whose name matches a run pattern.
+
+        Walks the tree with directory listings from :meth:`_listdir`, which
+        are reused while a directory is unchanged. Names are filtered on the
+        run pattern and on the supported data extensions before anything
+        else is done with them. Hidden entries are skipped and symlinked
+        directories are not followed; unreadable directories are ignored.
+
+        Args:
+            root: Search root directory
+            pattern: Regex searched for in file names (the run numbers)
+            recursive: Whether to descend into subdirectories
+
+        Yields:
+            Paths of candidate files
+        """
+        stack = [str(root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                subdirs, files = self._listdir(directory)
+            except OSError:
+                continue
             if recursive:
-                files = list(search_path.rglob("*"))
-            else:
-                files = list(search_path.glob("*"))
+                # Reversed so subdirectories are popped in listing order: the
+                # same depth-first order as Path.rglob, which decides which
+                # file wins a slot when several match
+                stack.extend(os.path.join(directory, name) for name in reversed(subdirs))
+            for name in files:
+                if pattern.search(name) and name.lower().endswith(DATA_FILE_SUFFIXES):
+                    yield os.path.join(directory, name)
+
+    def _listdir(self, directory: str) -> tuple[list[str], list[str]]:
+        """
+        List a directory, reusing the cached listing if it has not changed.
 
-            for file_path in files:
-                if not file_path.is_file():
-                    continue
+        Only names are cached; file contents and stats are always read fresh
+        when a file is detected. A directory's mtime changes when entries
+        are added, removed or renamed, so a cached listing is never stale
+        for the names it holds. At most ``_DIR_CACHE_MAX`` listings are
+        kept; the oldest is dropped first.
 
-                # Check if this file is related to our run
-                if run_str not in file_path.name:
-                    continue
+        Args:
+            directory: Directory path
 
-                file_info = detect_file(file_path)
+        Returns:
+            Names of the visible subdirectories (symlinks excluded) and
+            files of the directory
 
-                # Verify run number matches
-                if file_info.run_number != run_number:
+        Raises:
+            OSError: If the directory cannot be read
+        """
+        mtime_ns = os.stat(directory).st_mtime_ns
+        with self._dir_cache_lock:
+            cached = self._dir_cache.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+
+        subdirs = []
+        files = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith("."):
                     continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+
+        with self._dir_cache_lock:
+            self._dir_cache.pop(directory, None)
+            if len(self._dir_cache) >= _DIR_CACHE_MAX:
+                del self._dir_cache[next(iter(self._dir_cache))]
+            self._dir_cache[directory] = (mtime_ns, subdirs, files)
+        return subdirs, files
+
+    def invalidate_cache(self, path: Optional[str | Path] = None) -> None:
+        """
+        Drop cached directory listings.
 
-                # Assign to appropriate slot
-                self._assign_file(related, file_info)
+        Args:
+            path: Directory whose listings (including subdirectories) to
+                drop; all listings are dropped when None
+        """
+        with self._dir_cache_lock:
+            if path is None:
+                self._dir_cache.clear()
+                return
 
-        return related
+            directory = str(Path(path))
+            prefix = os.path.join(directory, "")
+            for key in list(self._dir_cache):
+                if key == directory or key.startswith(prefix):
+                    del self._dir_cache[key]
 
     def _assign_file(self, related: RelatedFiles, file_info: FileInfo) -> None:
         """Assign a file to the appropriate slot in RelatedFiles."""
         path = file_info.path
 
-        if file_info.file_type == FileType.REDUCED:
-            if related.reduced_file is None:
-                related.reduced_file = path
-
-        elif file_info.file_type == FileType.RAW_HDF5:
-            if related.raw_file is None:
-                related.raw_file = path
-
-        elif file_info.file_type == FileType.MODEL:
-            if related.model_file is None:
-                related.model_file = path
-
+        slot = _TYPE_SLOT.get(file_info.file_type)
+        if slot is not None:
+            if getattr(related, slot) is None:
+                setattr(related, slot, path)
         elif file_info.file_type == FileType.PARQUET:
             self._assign_parquet(related, path)
 
     def _assign_parquet(self, related: RelatedFiles, path: str) -> None:
         """Assign a parquet file to the appropriate slot."""
-        name = Path(path).name.lower()
-
-        if "metadata" in name:
-            if related.metadata_parquet is None:
-                related.metadata_parquet = path
-        elif "sample" in name:
-            if related.sample_parquet is None:
-                related.sample_parquet = path
-        elif "user" in name:
-            if related.users_parquet is None:
-                related.users_parquet = path
-        elif "daslog" in name:
-            if related.daslogs_parquet is None:
-                related.daslogs_parquet = path
-        elif "instrument" in name:
-            if related.instrument_parquet is None:
-                related.instrument_parquet = path
-        else:
+        kinds = _PARQUET_RE.findall(os.path.basename(path).lower())
+        if not kinds:
             related.other_parquet.append(path)
+            return
+
+        # A name can mention several kinds; keep the metadata > sample >
+        # user > daslog > instrument precedence rather than the leftmost hit
+        slot = next(slot for kind, slot in _PARQUET_SLOT.items() if kind in kinds)
+        if getattr(related, slot) is None:
+            setattr(related, slot, path)
 
     def find_from_file(self, file_path: str | Path) -> RelatedFiles:
         """
@@ -29,7 +29,7 @@ class FileType(str, Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
     """
     Information extracted from a detected file.
@@ -59,7 +59,7 @@ class FileInfo:
         return Path(self.path).exists()
 
 
-@dataclass
+@dataclass(slots=True)
 class RelatedFiles:
     """
     Collection of related files for a single run.
@@ -159,19 +159,19 @@ class RelatedFiles:
 
     def available_files(self) -> list[str]:
         """Get list of all available file paths."""
-        files = []
-        for attr in [
-            "reduced_file",
-            "raw_file",
-            "model_file",
-            "metadata_parquet",
-            "sample_parquet",
-            "users_parquet",
-            "daslogs_parquet",
-            "instrument_parquet",
-        ]:
-            path = getattr(self, attr)
-            if path:
-                files.append(path)
+        files = [
+            path
+            for path in (
+                self.reduced_file,
+                self.raw_file,
+                self.model_file,
+                self.metadata_parquet,
+                self.sample_parquet,
+                self.users_parquet,
+                self.daslogs_parquet,
+                self.instrument_parquet,
+            )
+            if path
+        ]
         files.extend(self.other_parquet)
         return files
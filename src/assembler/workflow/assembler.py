@@ -6,9 +6,16 @@ The main orchestrator for the ingestion workflow.
 
 import json
 import logging
+import math
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
+import numpy as np
+
+from assembler.instruments import InstrumentRegistry
+from assembler.parsers import ModelParser, ReducedParser
+from assembler.parsers.conditions import parse_conditions
 from assembler.parsers.model_parser import ModelData
 from assembler.parsers.parquet_parser import ParquetData
 from assembler.parsers.reduced_parser import ReducedData
@@ -17,12 +24,20 @@ from .builders import (
     build_environment_record,
     build_reflectivity_model_record,
     build_reflectivity_record,
+    build_reflectivity_records,
     build_sample_record,
 )
+from .builders.utils import new_record_id
 from .result import AssemblyResult
 
 logger = logging.getLogger(__name__)
 
+# Dataset auto-detection acceptance thresholds: RMS log-R difference
+# (log(1.1), i.e. model R within ~10% of the data) and summed relative
+# difference of the Q-range boundaries
+_R_MATCH_MAX_SCORE = math.log(1.1)
+_Q_RANGE_MATCH_MAX_SCORE = 0.5
+
 
 class DataAssembler:
     """
@@ -51,6 +66,17 @@ class DataAssembler:
             print(f"Review needed: {result.needs_review}")
     """
 
+    def __init__(self, include_model_json: bool = True):
+        """
+        Initialize the assembler.
+
+        Args:
+            include_model_json: Store the full model JSON in fit records. Turn
+                off when the model_json column is not needed (e.g. in-memory
+                checks) to skip carrying or serializing the whole model.
+        """
+        self.include_model_json = include_model_json
+
     def assemble(
         self,
         reduced: Optional[ReducedData] = None,
@@ -94,6 +120,10 @@ class DataAssembler:
             return result
 
         result.reduced_file = reduced.file_path
+        # Issue containers shared by every builder below
+        warnings, errors, needs_review = result.warnings, result.errors, result.needs_review
+        # One creation timestamp for every record of this assembly
+        now = datetime.now(timezone.utc)
 
         # Auto-detect dataset if model has multiple experiments and none was chosen
         if model is not None and model.dataset_index is None and model.num_datasets > 1:
@@ -104,39 +134,49 @@ class DataAssembler:
                     f"by reflectivity matching"
                 )
                 model.select_dataset(matched)
-                result.warnings.append(
+                warnings.append(
                     f"Auto-selected model dataset {matched + 1} of "
                     f"{model.num_datasets} (matched by reflectivity data)"
                 )
             else:
-                result.warnings.append(
+                warnings.append(
                     f"Model has {model.num_datasets} datasets but could not "
                     f"auto-detect match; using first dataset. "
                     f"Consider passing --model-dataset-index."
                 )
                 model.select_dataset(0)
 
+        # With parquet metadata, the reflectivity and environment builders both
+        # pick the handler for its instrument id; resolve it once for both
+        instrument_handler = None
+        if parquet is not None and parquet.metadata is not None:
+            instrument_handler = InstrumentRegistry.get_handler(parquet.instrument_id)
+
         # Step 1: Build Reflectivity record from reduced + parquet + model
         result.reflectivity = build_reflectivity_record(
             reduced=reduced,
             parquet=parquet,
-            warnings=result.warnings,
-            errors=result.errors,
-            needs_review=result.needs_review,
+            warnings=warnings,
+            errors=errors,
+            needs_review=needs_review,
+            instrument_handler=instrument_handler,
             model=model,
             raw_file_path_override=raw_file_path,
+            now=now,
         )
 
         # Step 2: Build Environment record from parquet daslogs
         if parquet is not None:
             result.environment = build_environment_record(
                 parquet=parquet,
-                warnings=result.warnings,
-                errors=result.errors,
-                needs_review=result.needs_review,
+                warnings=warnings,
+                errors=errors,
+                needs_review=needs_review,
+                instrument_handler=instrument_handler,
                 model=model,
                 description_override=environment_description,
                 conditions=conditions,
+                now=now,
             )
         elif environment_description is not None or conditions:
             # Create a minimal environment record from the description/conditions alone
@@ -144,6 +184,7 @@ class DataAssembler:
                 description=environment_description,
                 model=model,
                 conditions=conditions,
+                now=now,
             )
 
         # Step 3: Build Sample record from model (skip if reusing existing sample)
@@ -153,9 +194,10 @@ class DataAssembler:
         elif model is not None:
             result.sample = build_sample_record(
                 model=model,
-                warnings=result.warnings,
-                errors=result.errors,
-                needs_review=result.needs_review,
+                warnings=warnings,
+                errors=errors,
+                needs_review=needs_review,
+                now=now,
             )
 
         if model is not None:
@@ -171,11 +213,13 @@ class DataAssembler:
             result.reflectivity_model = build_reflectivity_model_record(
                 model=model,
                 measurement_ids=measurement_ids,
-                warnings=result.warnings,
-                errors=result.errors,
-                needs_review=result.needs_review,
+                warnings=warnings,
+                errors=errors,
+                needs_review=needs_review,
                 chi_squared=chi_squared,
                 sample_id=fit_sample_id,
+                now=now,
+                include_model_json=self.include_model_json,
             )
             if result.reflectivity_model and result.sample:
                 result.sample["fit_ids"] = [result.reflectivity_model["id"]]
@@ -200,9 +244,6 @@ class DataAssembler:
         Free-text conditions are parsed into structured electrochemical fields.
         Returns an AssemblyResult; the caller writes it out (parquet/json).
         """
-        from assembler.parsers import ModelParser, ReducedParser
-        from assembler.parsers.conditions import parse_conditions
-
         run_dir = Path(run_dir)
         result = AssemblyResult()
 
@@ -259,17 +300,14 @@ class DataAssembler:
             return assembled
 
         # Additional runs (other angles of the same state) → reflectivity-only.
-        for reduced_i in reduced_list[1:]:
-            refl_i = build_reflectivity_record(
-                reduced=reduced_i,
-                parquet=None,
-                warnings=assembled.warnings,
-                errors=assembled.errors,
-                needs_review=assembled.needs_review,
-                model=model,
-            )
-            if refl_i is not None:
-                assembled.additional_reflectivities.append(refl_i)
+        refls = build_reflectivity_records(
+            [(reduced_i, None) for reduced_i in reduced_list[1:]],
+            warnings=assembled.warnings,
+            errors=assembled.errors,
+            needs_review=assembled.needs_review,
+            model=model,
+        )
+        assembled.additional_reflectivities.extend(r for r in refls if r is not None)
 
         # Re-link so every run carries sample_id/environment_id and the
         # environment tracks all run ids.
@@ -324,6 +362,7 @@ class DataAssembler:
                 chi_squared=chi_squared,
                 datasets=datasets,
                 sample_id=fit_sample_id,
+                include_model_json=self.include_model_json,
             )
             if assembled.reflectivity_model and assembled.sample:
                 assembled.sample["fit_ids"] = [assembled.reflectivity_model["id"]]
@@ -352,9 +391,6 @@ class DataAssembler:
         co-refinement is ONE fit linking every run across every state. State
         identity comes from the explicit ``states[]`` block, never from file names.
         """
-        from assembler.parsers import ModelParser, ReducedParser
-        from assembler.parsers.conditions import parse_conditions
-
         result = AssemblyResult()
 
         # Fitted model (shared structure across all states of a co-refinement).
@@ -451,15 +487,14 @@ class DataAssembler:
             per_state_sids.append(state_sid)
 
             st_refls: list[dict] = []
-            for r in st_reduced:
-                refl = build_reflectivity_record(
-                    reduced=r,
-                    parquet=None,
-                    warnings=result.warnings,
-                    errors=result.errors,
-                    needs_review=result.needs_review,
-                    model=model,
-                )
+            refls = build_reflectivity_records(
+                [(r, None) for r in st_reduced],
+                warnings=result.warnings,
+                errors=result.errors,
+                needs_review=result.needs_review,
+                model=model,
+            )
+            for r, refl in zip(st_reduced, refls):
                 if refl is None:
                     continue
                 refl["sample_id"] = state_sid
@@ -534,6 +569,7 @@ class DataAssembler:
                 sample_id=shared_sid,
                 sample_ids=fit_sample_ids,
                 fit_strategy="multi_state_coref",
+                include_model_json=self.include_model_json,
             )
             if result.reflectivity_model:
                 fid = result.reflectivity_model["id"]
@@ -627,6 +663,7 @@ class DataAssembler:
         description: Optional[str] = None,
         model: Optional[ModelData] = None,
         conditions: Optional[dict[str, Any]] = None,
+        now: Optional[datetime] = None,
     ) -> dict[str, Any]:
         """
         Build a minimal environment record when no parquet data is available.
@@ -638,21 +675,19 @@ class DataAssembler:
         Args:
             description: User-provided environment description
             model: Optional model data for ambient medium extraction
+            now: Creation timestamp to stamp on the record (default: current UTC time)
 
         Returns:
             Dict matching ENVIRONMENT_SCHEMA
         """
-        import uuid
-        from datetime import datetime, timezone
-
         ambient_medium = None
         if model and model.ambient:
             ambient_medium = model.ambient.material.name
 
         cond = conditions or {}
         return {
-            "id": str(uuid.uuid4()),
-            "created_at": datetime.now(timezone.utc),
+            "id": new_record_id(),
+            "created_at": now or datetime.now(timezone.utc),
             "description": description,
             "ambient_medium": {
                 "name": ambient_medium,
@@ -678,7 +713,7 @@ class DataAssembler:
         Uses two strategies:
         1. Q-range comparison (min/max) — works when experiments have different Q ranges
         2. R-value correlation — interpolates model R onto reduced Q grid and compares
-           using mean absolute relative error. Works when Q grids overlap.
+           using the RMS difference of log R. Works when Q grids overlap.
 
         Args:
             model: Parsed model with raw_json containing multiple experiments
@@ -687,83 +722,74 @@ class DataAssembler:
         Returns:
             0-based experiment index, or None if no match found
         """
-        if not reduced.q or len(reduced.q) == 0:
+        if len(reduced.q) == 0:
             return None
 
-        from bisect import bisect_left
+        reduced_q_min, reduced_q_max = reduced.q_range
+        # Normalizers for the Q-range score, fixed across experiments
+        q_min_scale = max(reduced_q_min, 1e-10)
+        q_max_scale = max(reduced_q_max, 1e-10)
 
-        reduced_q_min = min(reduced.q)
-        reduced_q_max = max(reduced.q)
+        # Reduced arrays for the vectorized R comparison (R is optional)
+        rq = np.asarray(reduced.q, dtype=np.float64)
+        rr = None
+        if len(reduced.r) == len(reduced.q):
+            rr = np.asarray(reduced.r, dtype=np.float64)
 
         best_idx: Optional[int] = None
         best_score = float("inf")
+        best_max_score = 0.0
 
         for i in range(model.num_datasets):
-            probe_q = model.get_probe_q(i)
-            probe_r = model.get_probe_r(i)
-            if not probe_q or not probe_r:
+            probe_q, probe_r = model.get_probe_arrays(i)
+            if len(probe_q) == 0 or len(probe_r) == 0:
                 continue
 
             # Strategy 1: Q-range score (relative difference in boundaries)
-            q_min = min(probe_q)
-            q_max = max(probe_q)
-            min_diff = abs(reduced_q_min - q_min) / max(reduced_q_min, 1e-10)
-            max_diff = abs(reduced_q_max - q_max) / max(reduced_q_max, 1e-10)
+            q_min = float(probe_q[0])  # probe Q is sorted ascending
+            q_max = float(probe_q[-1])
+            min_diff = abs(reduced_q_min - q_min) / q_min_scale
+            max_diff = abs(reduced_q_max - q_max) / q_max_scale
             q_range_score = min_diff + max_diff
 
             # Strategy 2: R-value comparison via linear interpolation
             # Interpolate model R at each reduced Q point
             r_score = float("inf")
-            if reduced.r and len(reduced.r) == len(reduced.q) and len(probe_q) >= 2:
-                # Ensure probe_q is sorted for interpolation
-                if probe_q[0] <= probe_q[-1]:
-                    sorted_q = probe_q
-                    sorted_r = probe_r
-                else:
-                    pairs = sorted(zip(probe_q, probe_r))
-                    sorted_q = [p[0] for p in pairs]
-                    sorted_r = [p[1] for p in pairs]
-
-                total_err = 0.0
-                n_matched = 0
-                for j, rq in enumerate(reduced.q):
-                    # Only compare where reduced Q falls within model Q range
-                    if rq < sorted_q[0] or rq > sorted_q[-1]:
-                        continue
-                    # Find interpolation position
-                    pos = bisect_left(sorted_q, rq)
-                    if pos == 0:
-                        interp_r = sorted_r[0]
-                    elif pos >= len(sorted_q):
-                        interp_r = sorted_r[-1]
-                    else:
-                        # Linear interpolation
-                        q0, q1 = sorted_q[pos - 1], sorted_q[pos]
-                        r0, r1 = sorted_r[pos - 1], sorted_r[pos]
-                        t = (rq - q0) / (q1 - q0) if q1 != q0 else 0.5
-                        interp_r = r0 + t * (r1 - r0)
-
-                    # Relative error (use abs(reduced R) to normalize)
-                    rr = reduced.r[j]
-                    denom = max(abs(rr), 1e-12)
-                    total_err += abs(interp_r - rr) / denom
-                    n_matched += 1
-
-                if n_matched > 0:
-                    r_score = total_err / n_matched
+            # Disjoint Q ranges leave no points to compare; skip the interpolation
+            overlaps = q_min <= reduced_q_max and q_max >= reduced_q_min
+            if (
+                overlaps
+                and rr is not None
+                and len(probe_q) >= 2
+                and len(probe_r) == len(probe_q)
+            ):
+                # Only compare where reduced Q falls within model Q range
+                in_range = (rq >= q_min) & (rq <= q_max)
+                if in_range.any():
+                    interp_r = np.interp(rq[in_range], probe_q, probe_r)
+                    # R spans decades, so compare in log space; points with
+                    # non-positive R (background-subtracted noise) are left out
+                    rr_in = rr[in_range]
+                    positive = (interp_r > 0) & (rr_in > 0)
+                    if positive.any():
+                        log_diff = np.log(interp_r[positive]) - np.log(rr_in[positive])
+                        r_score = float(np.sqrt(np.mean(log_diff**2)))
 
             # Combined score: prefer R-value match when Q ranges are similar
             if r_score < float("inf"):
                 score = r_score  # R-value match is the primary discriminator
+                max_score = _R_MATCH_MAX_SCORE
             else:
                 score = q_range_score
+                max_score = _Q_RANGE_MATCH_MAX_SCORE
 
             if score < best_score:
                 best_score = score
+                best_max_score = max_score
                 best_idx = i
 
-        # Accept if R-value mean relative error < 10% or Q-range score < 0.5
-        if best_idx is not None and best_score < 0.5:
+        # Accept if R agrees within ~10% or the Q-range boundaries are close
+        if best_idx is not None and best_score < best_max_score:
             return best_idx
 
         return None
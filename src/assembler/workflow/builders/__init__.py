@@ -6,12 +6,16 @@ Each builder converts parsed data directly into schema-ready records
 """
 
 from assembler.workflow.builders.environment import build_environment_record
-from assembler.workflow.builders.reflectivity import build_reflectivity_record
+from assembler.workflow.builders.reflectivity import (
+    build_reflectivity_record,
+    build_reflectivity_records,
+)
 from assembler.workflow.builders.reflectivity_model import build_reflectivity_model_record
 from assembler.workflow.builders.sample import build_sample_record
 
 __all__ = [
     "build_reflectivity_record",
+    "build_reflectivity_records",
     "build_environment_record",
     "build_reflectivity_model_record",
     "build_sample_record",
@@ -3,13 +3,13 @@ Environment record builder.
 """
 
 import logging
-import uuid
 from datetime import datetime, timezone
 from typing import Any, Optional, Type
 
 from assembler.instruments import Instrument, InstrumentRegistry
 from assembler.parsers.model_parser import ModelData
 from assembler.parsers.parquet_parser import ParquetData
+from assembler.workflow.builders.utils import new_record_id
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,7 @@ def build_environment_record(
     model: Optional[ModelData] = None,
     description_override: Optional[str] = None,
     conditions: Optional[dict[str, Any]] = None,
+    now: Optional[datetime] = None,
 ) -> Optional[dict[str, Any]]:
     """
     Build an environment record from parquet daslogs.
@@ -38,6 +39,7 @@ def build_environment_record(
         instrument_handler: Optional specific instrument handler to use
         model: Optional model data for ambient medium extraction
         description_override: Optional text to use as the environment description
+        now: Creation timestamp to stamp on the record (default: current UTC time)
 
     Returns:
         Dict matching ENVIRONMENT_SCHEMA, or None on error
@@ -47,7 +49,7 @@ def build_environment_record(
         if instrument_handler is None:
             instrument_handler = InstrumentRegistry.get_handler(parquet.instrument_id)
 
-        logger.debug(f"Using instrument handler: {instrument_handler.name}")
+        logger.debug("Using instrument handler: %s", instrument_handler.name)
 
         # Extract environment using instrument-specific logic
         extracted = instrument_handler.extract_environment(parquet)
@@ -66,8 +68,8 @@ def build_environment_record(
         # Build the record matching ENVIRONMENT_SCHEMA
         record = {
             # Base fields
-            "id": str(uuid.uuid4()),
-            "created_at": datetime.now(timezone.utc),
+            "id": new_record_id(),
+            "created_at": now or datetime.now(timezone.utc),
             # Relationship field (to be linked by assembler)
             # Environment fields
             "description": description,
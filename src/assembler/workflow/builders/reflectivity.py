@@ -3,15 +3,17 @@ Reflectivity record builder.
 """
 
 import logging
-import uuid
 from datetime import datetime, timezone
-from typing import Any, Optional, Type
+from typing import Any, Iterable, Optional, Type
+
+import numpy as np
 
 from assembler.instruments import Instrument, InstrumentRegistry
 from assembler.parsers.model_parser import ModelData
 from assembler.parsers.parquet_parser import ParquetData
 from assembler.parsers.reduced_parser import ReducedData
 from assembler.tools.detection import extract_instrument
+from assembler.workflow.builders.utils import new_record_id
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,7 @@ def build_reflectivity_record(
     instrument_handler: Optional[Type[Instrument]] = None,
     model: Optional[ModelData] = None,
     raw_file_path_override: Optional[str] = None,
+    now: Optional[datetime] = None,
 ) -> Optional[dict[str, Any]]:
     """
     Build a reflectivity record from reduced and parquet data.
@@ -41,10 +44,14 @@ def build_reflectivity_record(
         needs_review: Dict to record fields needing review
         instrument_handler: Optional specific instrument handler to use
         model: Optional model data for geometry determination
+        now: Creation timestamp to stamp on the record (default: current UTC time)
 
     Returns:
         Dict matching REFLECTIVITY_SCHEMA, or None on error
     """
+    if now is None:
+        now = datetime.now(timezone.utc)
+
     try:
         # Get metadata from parquet if available, else from reduced header
         if parquet and parquet.metadata:
@@ -61,14 +68,11 @@ def build_reflectivity_record(
             facility = instrument_handler.defaults.facility
 
             # Parse start time
-            if meta.start_time:
-                try:
-                    run_start = datetime.fromisoformat(meta.start_time.replace("Z", "+00:00"))
-                except ValueError:
-                    run_start = datetime.now(timezone.utc)
+            run_start = _parse_iso_timestamp(meta.start_time)
+            if run_start is None:
+                if meta.start_time:
                     warnings.append(f"Could not parse start_time: {meta.start_time}")
-            else:
-                run_start = datetime.now(timezone.utc)
+                run_start = now
 
             raw_file_path = meta.source_path
         else:
@@ -95,15 +99,12 @@ def build_reflectivity_record(
 
             facility = instrument_handler.defaults.facility
 
-            run_start = None
             meta_start = meta.get("start_time")
-            if meta_start:
-                try:
-                    run_start = datetime.fromisoformat(meta_start.replace("Z", "+00:00"))
-                except (ValueError, TypeError):
-                    warnings.append(f"Could not parse Meta.start_time: {meta_start}")
+            run_start = _parse_iso_timestamp(meta_start)
+            if run_start is None and meta_start:
+                warnings.append(f"Could not parse Meta.start_time: {meta_start}")
             if run_start is None:
-                run_start = reduced.run_start_time or datetime.now(timezone.utc)
+                run_start = reduced.run_start_time or now
 
             raw_file_path = None
 
@@ -115,7 +116,7 @@ def build_reflectivity_record(
         if raw_file_path_override:
             raw_file_path = raw_file_path_override
 
-        logger.debug(f"Using instrument handler: {instrument_handler.name}")
+        logger.debug("Using instrument handler: %s", instrument_handler.name)
 
         # Determine measurement geometry from model layer order
         # If first layer is ambient (thickness=0, typically air) -> back reflection
@@ -135,18 +136,20 @@ def build_reflectivity_record(
                 "Could not determine geometry - no model data provided"
             )
 
+        defaults = instrument_handler.defaults
+
         # Build the record matching REFLECTIVITY_SCHEMA
         record = {
             # Base fields
-            "id": str(uuid.uuid4()),
-            "created_at": datetime.now(timezone.utc),
+            "id": new_record_id(),
+            "created_at": now,
             # Measurement fields
             "proposal_number": proposal_number,
             "facility": facility,
-            "laboratory": instrument_handler.defaults.laboratory,
-            "probe": instrument_handler.defaults.probe,
-            "technique": instrument_handler.defaults.technique,
-            "technique_description": instrument_handler.defaults.technique_description,
+            "laboratory": defaults.laboratory,
+            "probe": defaults.probe,
+            "technique": defaults.technique,
+            "technique_description": defaults.technique_description,
             "is_simulated": False,
             "run_title": run_title,
             "run_number": run_number,
@@ -165,9 +168,7 @@ def build_reflectivity_record(
 
         # Run instrument-specific validation (creates a temp object for validation)
         # We pass the record data for validation
-        validation_warnings = _validate_reflectivity_data(record)
-        for warning in validation_warnings:
-            warnings.append(warning)
+        warnings.extend(_validate_reflectivity_data(record))
         return record
 
     except Exception as e:
@@ -176,31 +177,104 @@ def build_reflectivity_record(
         return None
 
 
+def build_reflectivity_records(
+    items: Iterable[tuple[ReducedData, Optional[ParquetData]]],
+    warnings: list[str],
+    errors: list[str],
+    needs_review: dict[str, Any],
+    model: Optional[ModelData] = None,
+    now: Optional[datetime] = None,
+) -> list[Optional[dict[str, Any]]]:
+    """
+    Build reflectivity records for several runs.
+
+    All records share one creation timestamp, and the instrument handler
+    for runs with parquet metadata is resolved once per instrument id.
+
+    Args:
+        items: (reduced, parquet) pairs, one per run; parquet may be None
+        warnings: List to append warnings to
+        errors: List to append errors to
+        needs_review: Dict to record fields needing review
+        model: Optional model data for geometry determination
+        now: Creation timestamp to stamp on the records (default: current UTC time)
+
+    Returns:
+        One record per item, in order; None where a record could not be built
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    handlers: dict[Optional[str], Type[Instrument]] = {}
+    records = []
+    for reduced, parquet in items:
+        instrument_handler = None
+        if parquet is not None and parquet.metadata is not None:
+            instrument_id = parquet.instrument_id
+            instrument_handler = handlers.get(instrument_id)
+            if instrument_handler is None:
+                instrument_handler = InstrumentRegistry.get_handler(instrument_id)
+                handlers[instrument_id] = instrument_handler
+
+        records.append(
+            build_reflectivity_record(
+                reduced=reduced,
+                parquet=parquet,
+                warnings=warnings,
+                errors=errors,
+                needs_review=needs_review,
+                instrument_handler=instrument_handler,
+                model=model,
+                now=now,
+            )
+        )
+    return records
+
+
+def _parse_iso_timestamp(value: Any) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 timestamp, returning None if it is not one.
+
+    Every ISO 8601 date starts with a four-digit year, so anything else is
+    rejected up front without raising; only near-misses (e.g. month 13)
+    still go through the exception path. A trailing ``Z`` is parsed as UTC
+    by ``fromisoformat`` itself (Python 3.11+).
+    """
+    if not isinstance(value, str) or not value[:4].isdigit():
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 def _validate_reflectivity_data(
     record: dict[str, Any],
 ) -> list[str]:
     """Validate reflectivity data and return warnings."""
     warnings = []
 
-    q = record.get("q", []) or []
-    r = record.get("r", []) or []
-    dr = record.get("dr", []) or []
-    dq = record.get("dq", []) or []
+    q, r, dr, dq = (record.get(key) for key in ("q", "r", "dr", "dq"))
+    # Lengths computed once; None-tolerant so ndarray columns work too
+    n, n_r, n_dr, n_dq = (0 if col is None else len(col) for col in (q, r, dr, dq))
 
     # Check array lengths match
-    if not (len(q) == len(r) == len(dr) == len(dq)):
-        warnings.append(
-            f"Array length mismatch: q={len(q)}, r={len(r)}, dr={len(dr)}, dq={len(dq)}"
-        )
+    if not (n == n_r == n_dr == n_dq):
+        warnings.append(f"Array length mismatch: q={n}, r={n_r}, dr={n_dr}, dq={n_dq}")
 
     # Check for reasonable data size
-    if len(q) < 10:
-        warnings.append(f"Only {len(q)} data points - unusually small dataset")
+    if n < 10:
+        warnings.append(f"Only {n} data points - unusually small dataset")
+        if n == 0:
+            return warnings
 
-    # Check Q range
-    if q:
+    # Check Q range (converting a list to numpy costs more than the builtin
+    # scan saves, so only ndarray input uses the numpy reductions)
+    if isinstance(q, np.ndarray):
+        q_min, q_max = float(q.min()), float(q.max())
+    else:
         q_min, q_max = min(q), max(q)
-        if q_max < 0.01:
-            warnings.append(f"Q range very small: {q_min:.4f} - {q_max:.4f} Å⁻¹")
+    if q_max < 0.01:
+        warnings.append(f"Q range very small: {q_min:.4f} - {q_max:.4f} Å⁻¹")
 
     return warnings
@@ -7,11 +7,11 @@ refl1d/bumps model JSON file.
 
 import json
 import logging
-import uuid
 from datetime import datetime, timezone
 from typing import Any, Optional
 
 from assembler.parsers.model_parser import ModelData, ModelLayer
+from assembler.workflow.builders.utils import new_record_id
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +49,8 @@ def build_reflectivity_model_record(
     fit_strategy: Optional[str] = None,
     shared_parameters: Optional[list[str]] = None,
     unshared_parameters: Optional[list[str]] = None,
+    now: Optional[datetime] = None,
+    include_model_json: bool = True,
 ) -> Optional[dict[str, Any]]:
     """
     Build a reflectivity model (fit) record from parsed model data.
@@ -76,6 +78,9 @@ def build_reflectivity_model_record(
         fit_strategy: ``single`` | ``single_state_coref`` | ``multi_state_coref``;
             defaulted from ``num_experiments`` when not given.
         shared_parameters / unshared_parameters: tied/free parameter names.
+        now: Creation timestamp to stamp on the record (default: current UTC time)
+        include_model_json: Whether to store the full model JSON; when False
+            ``model_json`` is None
 
     Returns:
         Dict matching REFLECTIVITY_MODEL_SCHEMA, or None on error
@@ -156,12 +161,12 @@ def build_reflectivity_model_record(
             fit_strategy = "single" if num_experiments <= 1 else "single_state_coref"
 
         # Serialize the full JSON for the model_json column
-        model_json = json.dumps(raw, default=str)
+        model_json = json.dumps(raw, default=str) if include_model_json else None
 
         record = {
             # Base fields
-            "id": str(uuid.uuid4()),
-            "created_at": datetime.now(timezone.utc),
+            "id": new_record_id(),
+            "created_at": now or datetime.now(timezone.utc),
             "is_deleted": False,
             # Relationships
             "measurement_ids": measurement_ids,
@@ -2,23 +2,26 @@
 Sample record builder.
 """
 
-import json
 import logging
-import uuid
 from datetime import datetime, timezone
+from operator import attrgetter
 from typing import Any, Optional
 
 from assembler.parsers.model_parser import ModelData
-from assembler.workflow.builders.utils import determine_main_composition
+from assembler.workflow.builders.utils import new_record_id
 
 logger = logging.getLogger(__name__)
 
+# Layer names too generic to identify the material; flagged for review
+_GENERIC_LAYER_NAMES = frozenset({"material", "layer", "film"})
+
 
 def build_sample_record(
     model: ModelData,
     warnings: list[str],
     errors: list[str],
     needs_review: dict[str, Any],
+    now: Optional[datetime] = None,
 ) -> Optional[dict[str, Any]]:
     """
     Build a sample record from model JSON data.
@@ -31,16 +34,15 @@ def build_sample_record(
         warnings: List to append warnings to
         errors: List to append errors to
         needs_review: Dict to record fields needing review
+        now: Creation timestamp to stamp on the record (default: current UTC time)
 
     Returns:
         Dict matching SAMPLE_SCHEMA, or None on error
     """
     try:
-        layers_json_list = []
-        substrate = None
-
-        for i, model_layer in enumerate(model.layers):
-            layer_dict = {
+        layers = model.layers
+        layers_json_list = [
+            {
                 "name": model_layer.name,
                 "thickness": model_layer.thickness,
                 "roughness": model_layer.interface,
@@ -49,38 +51,49 @@ def build_sample_record(
                     "sld": model_layer.material.rho,
                     "isld": model_layer.material.irho,
                     "mass": None,
-                    "density":None
+                    "density": None,
                 },
             }
-            # Last layer with zero thickness is substrate
-            if i == len(model.layers) - 1 and model_layer.thickness == 0:
-                substrate = layer_dict
-            else:
-                layers_json_list.append(layer_dict)
-                # Build struct for schema
-
-            # Flag generic layer names for review
-            if model_layer.name.lower() in ["material", "layer", "film"]:
-                needs_review[f"layer_{i}_name"] = (
+            for model_layer in layers
+        ]
+
+        # Last layer with zero thickness is substrate
+        substrate = None
+        if layers and layers[-1].thickness == 0:
+            substrate = layers_json_list.pop()
+
+        # Flag generic layer names for review
+        needs_review.update(
+            {
+                f"layer_{i}_name": (
                     f"Generic layer name '{model_layer.name}' - "
                     f"SLD: {model_layer.material.rho:.2f}, "
                     f"thickness: {model_layer.thickness:.1f} Å"
                 )
+                for i, model_layer in enumerate(layers)
+                if model_layer.name.lower() in _GENERIC_LAYER_NAMES
+            }
+        )
 
-        # Determine main composition from thickest layer
-        main_composition = determine_main_composition(layers_json_list)
+        # Determine main composition from the thickest layer, read straight
+        # off the typed layers (the zero-thickness substrate never qualifies)
+        thickest = max(
+            (model_layer for model_layer in layers if (model_layer.thickness or 0) > 0),
+            key=attrgetter("thickness"),
+            default=None,
+        )
+        main_composition = thickest.material.name if thickest else "Unknown"
 
         # Generate description
         ambient_name = model.ambient.material.name if model.ambient else "air"
-        description = f"{main_composition} in {ambient_name}"
-        if substrate:
-            description += f" on {substrate['material']['name']}"
+        on_substrate = f" on {substrate['material']['name']}" if substrate else ""
+        description = f"{main_composition} in {ambient_name}{on_substrate}"
 
         # Build the record matching SAMPLE_SCHEMA
         record = {
             # Base fields
-            "id": str(uuid.uuid4()),
-            "created_at": datetime.now(timezone.utc),
+            "id": new_record_id(),
+            "created_at": now or datetime.now(timezone.utc),
             #"is_deleted": False,
             # Sample fields
             "description": description,
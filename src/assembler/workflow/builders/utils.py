@@ -3,22 +3,66 @@ Utility functions and constants for record builders.
 """
 
 import logging
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Random bytes drawn per refill of the record-id pool (256 ids)
+_ID_POOL_BYTES = 4096
+
+_id_lock = threading.Lock()
+_id_pool = ""
+_id_offset = 0
+
+
+def _fill_id_pool() -> str:
+    """Draw a block of random UUIDs, returned as one concatenated hex string."""
+    buf = bytearray(os.urandom(_ID_POOL_BYTES))
+    # Stamp the version 4 / RFC 4122 variant bits into every 16-byte slot
+    buf[6::16] = bytes((b & 0x0F) | 0x40 for b in buf[6::16])
+    buf[8::16] = bytes((b & 0x3F) | 0x80 for b in buf[8::16])
+    return buf.hex()
+
+
+def new_record_id() -> str:
+    """
+    Return a new random (version 4) UUID string for a record id.
+
+    Equivalent to ``str(uuid.uuid4())``, but the entropy is drawn in
+    blocks and the canonical string is sliced straight from hex, which
+    is several times cheaper per id when assembling many records.
+    """
+    global _id_pool, _id_offset
+    with _id_lock:
+        if _id_offset >= len(_id_pool):
+            _id_pool = _fill_id_pool()
+            _id_offset = 0
+        h = _id_pool[_id_offset : _id_offset + 32]
+        _id_offset += 32
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _reset_id_pool() -> None:
+    """Discard the id pool in a forked child so it never repeats the parent's ids."""
+    global _id_lock, _id_pool, _id_offset
+    _id_lock = threading.Lock()
+    _id_pool = ""
+    _id_offset = 0
+
+
+os.register_at_fork(after_in_child=_reset_id_pool)
+
 
 def determine_main_composition(layers: list[dict]) -> str:
     """Determine main composition from thickest layer."""
-    main_composition = "Unknown"
-    max_thickness = 0
-
-    for layer in layers:
-        thickness = layer.get("thickness", 0)
-        if thickness and thickness > max_thickness:
-            max_thickness = thickness
-            material = layer.get("material", {})
-            main_composition = (
-                material.get("name", "Unknown") if isinstance(material, dict) else "Unknown"
-            )
-
-    return main_composition
+    thickest = max(
+        (layer for layer in layers if (layer.get("thickness") or 0) > 0),
+        key=lambda layer: layer["thickness"],
+        default=None,
+    )
+    if thickest is None:
+        return "Unknown"
+
+    material = thickest.get("material", {})
+    return material.get("name", "Unknown") if isinstance(material, dict) else "Unknown"
@@ -8,7 +8,7 @@ from dataclasses import dataclass, field
 from typing import Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class AssemblyResult:
     """
     Result of assembling data from multiple sources.
@@ -168,12 +168,10 @@ class AssemblyResult:
 
         if self.warnings:
             lines.append(f"\nWarnings ({len(self.warnings)}):")
-            for w in self.warnings[:5]:  # Limit to first 5
-                lines.append(f"  - {w}")
+            lines.extend(f"  - {w}" for w in self.warnings[:5])  # Limit to first 5
 
         if self.errors:
             lines.append(f"\nErrors ({len(self.errors)}):")
-            for e in self.errors:
-                lines.append(f"  - {e}")
+            lines.extend(f"  - {e}" for e in self.errors)
 
         return "\n".join(lines)
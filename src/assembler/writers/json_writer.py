@@ -10,10 +10,11 @@ from __future__ import annotations
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
-from assembler.workflow import AssemblyResult
+if TYPE_CHECKING:
+    from assembler.workflow import AssemblyResult
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -7,8 +7,9 @@ to Parquet files suitable for Apache Iceberg tables.
 
 from __future__ import annotations
 
+import uuid
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable
 
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -23,6 +24,9 @@ from .schemas import (
 if TYPE_CHECKING:
     from assembler.workflow import AssemblyResult
 
+# Rows per row group in batched (many records per file) output
+BATCH_ROW_GROUP_SIZE = 100_000
+
 
 class ParquetWriter:
     """
@@ -105,12 +109,8 @@ class ParquetWriter:
             Path to the written file (for single records), or
             Dict mapping table names to paths (for AssemblyResult)
         """
-        # Check if it's an AssemblyResult
-        if (
-            hasattr(data, "reflectivity")
-            and hasattr(data, "sample")
-            and hasattr(data, "environment")
-        ):
+        # Anything that isn't a record dict is an AssemblyResult
+        if not isinstance(data, dict):
             return self._write_assembly_result(data, **partition_kwargs)
 
         # It's a dict record - need table_type
@@ -202,12 +202,11 @@ class ParquetWriter:
             Path to the written file
         """
         # Auto-detect partitions from data
+        auto_facility, auto_year = self._reflectivity_partition(record)
         if facility is None:
-            facility = record.get("facility")
+            facility = auto_facility
         if year is None:
-            run_start = record.get("run_start")
-            if run_start and hasattr(run_start, "year"):
-                year = run_start.year
+            year = auto_year
 
         table = pa.Table.from_pylist([record], schema=REFLECTIVITY_SCHEMA)
 
@@ -224,6 +223,13 @@ class ParquetWriter:
         pq.write_table(table, output_path)
         return output_path
 
+    @staticmethod
+    def _reflectivity_partition(record: dict[str, Any]) -> tuple[str | None, int | None]:
+        """Get the (facility, year) partition of a reflectivity record."""
+        run_start = record.get("run_start")
+        year = run_start.year if run_start and hasattr(run_start, "year") else None
+        return record.get("facility"), year
+
     def write_sample(self, record: dict[str, Any]) -> Path:
         """
         Write a sample record to Parquet.
@@ -315,6 +321,79 @@ class ParquetWriter:
         """
         return [self.write(record, table_type=table_type, **partition_kwargs) for record in records]
 
+    def write_assemblies(
+        self,
+        results: Iterable[AssemblyResult],
+        row_group_size: int = BATCH_ROW_GROUP_SIZE,
+    ) -> dict[str, list[Path]]:
+        """
+        Write the records of many assembly results into shared Parquet files.
+
+        Unlike :meth:`write`, which produces one small file per record, the
+        records of each table are gathered and written as a single file per
+        table (per facility/year partition for reflectivity). Every call
+        uses a fresh batch id in the file names, so repeated calls add files
+        rather than overwrite earlier batches.
+
+        Args:
+            results: Assembly results to write
+            row_group_size: Maximum rows per Parquet row group
+
+        Returns:
+            Dict mapping table names to the written file paths
+        """
+        reflectivities: dict[tuple[str | None, int | None], list[dict[str, Any]]] = {}
+        samples: list[dict[str, Any]] = []
+        environments: list[dict[str, Any]] = []
+        models: list[dict[str, Any]] = []
+
+        for result in results:
+            for refl in result.reflectivities:
+                partition = self._reflectivity_partition(refl)
+                reflectivities.setdefault(partition, []).append(refl)
+            samples.extend(result.samples)
+            environments.extend(result.environments)
+            if result.reflectivity_model:
+                models.append(result.reflectivity_model)
+
+        filename = f"batch-{uuid.uuid4()}.parquet"
+
+        paths: dict[str, list[Path]] = {}
+        for (facility, year), records in reflectivities.items():
+            partition_dir = self._get_partition_path("reflectivity", facility, year)
+            paths.setdefault("reflectivity", []).append(
+                self._write_batch_table(
+                    records, REFLECTIVITY_SCHEMA, partition_dir / filename, row_group_size
+                )
+            )
+        for table_name, records, schema in (
+            ("sample", samples, SAMPLE_SCHEMA),
+            ("environment", environments, ENVIRONMENT_SCHEMA),
+            ("reflectivity_model", models, REFLECTIVITY_MODEL_SCHEMA),
+        ):
+            if records:
+                partition_dir = self._get_partition_path(table_name)
+                paths[table_name] = [
+                    self._write_batch_table(
+                        records, schema, partition_dir / filename, row_group_size
+                    )
+                ]
+
+        return paths
+
+    @staticmethod
+    def _write_batch_table(
+        records: list[dict[str, Any]],
+        schema: pa.Schema,
+        output_path: Path,
+        row_group_size: int,
+    ) -> Path:
+        """Write the records of one batched table to a single Parquet file."""
+        table = pa.Table.from_pylist(records, schema=schema)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, output_path, row_group_size=row_group_size)
+        return output_path
+
 
 def write_assembly_to_parquet(result: AssemblyResult, output_dir: str | Path) -> dict[str, Path]:
     """
@@ -362,3 +441,34 @@ def write_assembly_to_parquet(result: AssemblyResult, output_dir: str | Path) ->
         paths["reflectivity_model"] = writer.write_reflectivity_model(result.reflectivity_model)
 
     return paths
+
+
+def write_assemblies_to_parquet(
+    results: Iterable[AssemblyResult],
+    output_dir: str | Path,
+    row_group_size: int = BATCH_ROW_GROUP_SIZE,
+) -> dict[str, list[Path]]:
+    """
+    Convenience function to write many assemblies into one file per table.
+
+    Prefer this over calling :func:`write_assembly_to_parquet` per result
+    when ingesting many runs: it avoids producing one tiny Parquet file
+    (with its own footer and metadata) per record.
+
+    Args:
+        results: The AssemblyResults from DataAssembler
+        output_dir: Directory for output files
+        row_group_size: Maximum rows per Parquet row group
+
+    Returns:
+        Dict mapping table names to written file paths
+
+    Example::
+
+        assembler = DataAssembler()
+        results = [assembler.assemble(**job) for job in jobs]
+
+        paths = write_assemblies_to_parquet(results, "/data/lakehouse")
+        print(f"Wrote reflectivity to: {paths['reflectivity']}")
+    """
+    return ParquetWriter(output_dir).write_assemblies(results, row_group_size=row_group_size)
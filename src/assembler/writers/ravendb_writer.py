@@ -10,12 +10,13 @@ from __future__ import annotations
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 import requests
 
-from assembler.workflow import AssemblyResult
+if TYPE_CHECKING:
+    from assembler.workflow import AssemblyResult
 
 HOSTNAME = "http://0.0.0.0:3000"
 
@@ -35,6 +35,20 @@ class TestInstrumentRegistry:
         handler = InstrumentRegistry.get_handler(None)
         assert handler == GenericInstrument
 
+    def test_get_handler_cache_cleared_on_register(self, monkeypatch):
+        """Registering a handler re-resolves ids cached as generic."""
+        monkeypatch.setattr(InstrumentRegistry, "_handlers", dict(InstrumentRegistry._handlers))
+        monkeypatch.setattr(InstrumentRegistry, "_resolved", {})
+        assert InstrumentRegistry.get_handler("NEWREFL_1") == GenericInstrument
+
+        class NEWREFL(Instrument):
+            name = "NEWREFL"
+            aliases = []
+
+        InstrumentRegistry.register(NEWREFL)
+        assert InstrumentRegistry.get_handler("NEWREFL_1") == NEWREFL
+        assert InstrumentRegistry.get_handler("REF_L_123") == REF_L
+
 
 class TestREFL:
     """Tests for the REF_L instrument handler."""
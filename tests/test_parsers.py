@@ -2,11 +2,14 @@
 Tests for file parsers.
 """
 
+import dataclasses
 import pytest
 import json
 import tempfile
 from pathlib import Path
 
+import numpy as np
+
 from assembler.parsers import (
     ReducedParser,
     ModelParser,
@@ -82,6 +85,18 @@ class TestReducedParser:
         assert data.meta["wl_min"] == pytest.approx(2.679749638902263)
         assert data.meta["scaling_factors"] == {"a": 25.0, "err_a": 0, "b": 0, "err_b": 0}
 
+    def test_parses_header_fields_from_fixture(self):
+        fixture = Path(__file__).parent / "data" / "REFL_226658_2_226659_partial.txt"
+        data = ReducedParser().parse(fixture)
+
+        assert data.experiment_id == "IPTS-36897"
+        assert data.run_number == 226659
+        assert data.reduction_version == "2.10.0.dev1"
+        assert data.run_title == "Sample_5-226658-2."
+        assert data.run_start_time.year == 2026
+        assert data.reduction_time.month == 4
+        assert [run.two_theta for run in data.runs] == pytest.approx([2.40018])
+
     def test_meta_absent_does_not_error(self, sample_reduced_content):
         data = ReducedParser().parse_content(sample_reduced_content, "test.txt")
         assert data.meta is None
@@ -96,6 +111,27 @@ class TestReducedParser:
         assert data.meta is None
         assert data.experiment_id == "IPTS-1"
 
+    def test_malformed_data_lines_are_skipped(self):
+        content = (
+            "0.01 1.0 0.01 0.001\n"
+            "0.02 0.5\n"
+            "0.03 abc 0.0025 0.0015\n"
+            "0.04 0.125 0.00125 0.002 99\n"
+        )
+        data = ReducedParser().parse_content(content, "partial.txt")
+        assert data.q == pytest.approx([0.01, 0.04])
+        assert data.r == pytest.approx([1.0, 0.125])
+        assert data.dq == pytest.approx([0.001, 0.002])
+
+    def test_q_range(self):
+        assert ReducedData(file_path="").q_range == (0.0, 0.0)
+        assert ReducedData(file_path="", q=[0.03, 0.01, 0.02]).q_range == (0.01, 0.03)
+
+        q = [0.5 - 0.001 * i for i in range(400)]
+        assert ReducedData(file_path="", q=q).q_range == (min(q), max(q))
+        assert ReducedData(file_path="", q=np.array(q)).q_range == (min(q), max(q))
+        assert ReducedData(file_path="", q=np.array([])).q_range == (0.0, 0.0)
+
 
 class TestModelParser:
     """Tests for the model JSON parser."""
@@ -190,6 +226,30 @@ class TestModelParser:
         assert film.interface == pytest.approx(5.0)
         assert film.material.rho == pytest.approx(6.0e-6)
     
+    def test_layers_materialized_lazily(self, sample_model_json):
+        """Layers are built on first access; assignment replaces them."""
+        data = ModelParser().parse_dict(sample_model_json)
+        assert data._layers is None
+
+        assert [layer.name for layer in data.layers] == ["air", "film", "substrate"]
+        assert data.layers is data.layers
+
+        data.layers = data.layers[:1]
+        assert data.num_layers == 1
+        assert ModelData(file_path="empty.json").layers == []
+
+    def test_layers_behave_as_a_dataclass_field(self, sample_model_json):
+        """Deferred layers still show up in replace(), asdict() and equality."""
+        data = ModelParser().parse_dict(sample_model_json)
+
+        copied = dataclasses.replace(data, file_path="copy.json")
+        assert [layer.name for layer in copied.layers] == ["air", "film", "substrate"]
+        assert [layer["name"] for layer in dataclasses.asdict(data)["layers"]] == [
+            "air", "film", "substrate"
+        ]
+        assert ModelData(file_path="", layers=data.layers[:1]).layers == data.layers[:1]
+        assert ModelParser().parse_dict(sample_model_json) == data
+
     def test_parse_file(self, sample_model_json, tmp_path):
         """Test parsing from file."""
         file_path = tmp_path / "model.json"
@@ -211,6 +271,50 @@ class TestModelParser:
         assert len(data.film_layers) == 1
         assert data.total_thickness == pytest.approx(100.0)
 
+    def test_parse_file_with_nonfinite_literals(self, sample_model_json, tmp_path):
+        """bumps may write NaN/Infinity, which strict decoders reject."""
+        sample_model_json["references"]["ref1"]["bounds"] = [50.0, float("inf")]
+        file_path = tmp_path / "model.json"
+        file_path.write_text(json.dumps(sample_model_json))
+
+        data = ModelParser().parse(file_path)
+        assert data.layers[1].thickness == pytest.approx(100.0)
+        assert data.raw_json["references"]["ref1"]["bounds"][1] == float("inf")
+
+    def test_derived_properties_refresh_on_select_dataset(self, sample_model_json):
+        """Cached substrate/film values follow the selected dataset."""
+        layers = sample_model_json["object"]["sample"]["layers"]
+        sample_model_json["object"]["models"] = [
+            {"sample": {"layers": layers}},
+            {"sample": {"layers": layers[:2]}},
+        ]
+        data = ModelParser().parse_dict(sample_model_json)
+        assert data.substrate.name == "substrate"
+        assert data.total_thickness == pytest.approx(100.0)
+
+        data.select_dataset(1)
+        assert data.substrate is None
+        assert [l.name for l in data.film_layers] == ["film"]
+
+    def test_probe_arrays_sorted_and_cached(self):
+        models = [
+            {"probe": {"Q": {"values": [0.03, 0.02, 0.01]}, "R": {"values": [0.1, 0.5, 1.0]}}},
+            {"probe": {}},
+        ]
+        data = ModelData(file_path="", raw_json={"object": {"models": models}})
+
+        q, r = data.get_probe_arrays(0)
+        assert q.tolist() == [0.01, 0.02, 0.03]
+        assert r.tolist() == [1.0, 0.5, 0.1]
+        assert data.get_probe_arrays(0)[0] is q
+        assert [len(a) for a in data.get_probe_arrays(1)] == [0, 0]
+
+        models[1]["probe"] = {"Q": {"values": [0.01, 0.03, 0.02]}, "R": {"values": [3, 1, 2]}}
+        data = ModelData(file_path="", raw_json={"object": {"models": models}})
+        q, r = data.get_probe_arrays(1)
+        assert q.tolist() == [0.01, 0.02, 0.03]
+        assert r.tolist() == [3, 2, 1]
+
     def test_std_none_without_error_data(self, sample_model_json):
         """Test that std fields are None when no error data is provided."""
         parser = ModelParser()
@@ -306,6 +410,89 @@ class TestModelParser:
         assert data.layers[2].interface_std is None
 
 
+_CACHED_MODEL_JSON = {
+    "references": {
+        "ref1": {
+            "__class__": "bumps.parameter.Parameter",
+            "name": "film thickness",
+            "fixed": False,
+            "slot": {"value": 100.0},
+        },
+    },
+    "object": {
+        "sample": {
+            "layers": [
+                {"name": "air", "thickness": 0.0, "interface": 0.0,
+                 "material": {"name": "air", "rho": 0.0, "irho": 0.0}},
+                {"name": "film", "thickness": {"__class__": "Reference", "id": "ref1"},
+                 "interface": 5.0, "material": {"name": "Cu", "rho": 6.0, "irho": 0.0}},
+            ],
+        },
+    },
+}
+
+
+def _reduced_content(changed=False):
+    content = (Path(__file__).parent / "data" / "REFL_226658_2_226659_partial.txt").read_text()
+    return content + "0.0500   0.06250   0.00060   0.00250\n" if changed else content
+
+
+def _model_content(changed=False):
+    data = json.loads(json.dumps(_CACHED_MODEL_JSON))
+    sample = data["object"]["sample"]
+    data["object"]["models"] = [{"sample": sample}, {"sample": {"layers": sample["layers"][:1]}}]
+    if changed:
+        data["references"]["ref1"]["slot"]["value"] = 125.5
+    return json.dumps(data)
+
+
+def _mutate_reduced(data):
+    data.q.append(1.0)
+    data.runs[0].two_theta = -1.0
+    data.meta["experiment"] = "IPTS-0"
+
+
+def _mutate_model(data):
+    data.raw_json["references"]["ref1"]["slot"]["value"] = -1.0
+    data.layers[1].thickness = -1.0
+    data.select_dataset(1)
+
+
+@pytest.mark.parametrize(
+    "parser_cls, hook, file_name, content, mutate",
+    [
+        (ReducedParser, "parse_content", "REFL_226659.txt", _reduced_content, _mutate_reduced),
+        (ModelParser, "parse_dict", "model.json", _model_content, _mutate_model),
+    ],
+    ids=["reduced", "model"],
+)
+def test_repeated_parses_are_independent(tmp_path, parser_cls, hook, file_name, content, mutate):
+    """Each parse reflects the file and the parser class, not earlier results."""
+    file_path = tmp_path / file_name
+    file_path.write_text(content())
+
+    first = parser_cls().parse(file_path)
+    expected = parser_cls().parse(file_path)
+    assert first is not expected
+    assert first == expected
+
+    mutate(first)
+    assert first != expected
+    assert parser_cls().parse(file_path) == expected
+
+    def tagged(parser, *args, **kwargs):
+        data = getattr(parser_cls, hook)(parser, *args, **kwargs)
+        data.file_path = "tagged"
+        return data
+
+    tagged_cls = type("Tagged" + parser_cls.__name__, (parser_cls,), {hook: tagged})
+    assert tagged_cls().parse(file_path).file_path == "tagged"
+    assert parser_cls().parse(file_path) == expected
+
+    file_path.write_text(content(changed=True))
+    assert parser_cls().parse(file_path) != expected
+
+
 class TestParquetParser:
     """Tests for the parquet parser."""
     
@@ -3,29 +3,52 @@ Tests for workflow components (Phase 1B).
 """
 
 import json
+import os
+import subprocess
+import sys
 import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
 import pyarrow as pa
 import pyarrow.parquet as pq
 
-from assembler.parsers.model_parser import ModelData, ModelLayer, ModelMaterial
+from assembler.parsers.model_parser import ModelData, ModelLayer, ModelMaterial, ModelParser
 from assembler.parsers.parquet_parser import MetadataRecord, ParquetData
 from assembler.parsers.reduced_parser import ReducedData
 from assembler.tools import (
     FileType,
 )
 from assembler.tools.detection import (
+    classify_by_name,
+    clear_detection_cache,
+    detect_file,
     detect_file_type,
+    detect_file_type_by_name,
     extract_ipts,
     extract_run_number,
 )
+from assembler.tools.finder import FileFinder
 from assembler.tools.types import FileInfo, RelatedFiles
 from assembler.workflow import AssemblyResult, DataAssembler
-from assembler.workflow.builders import build_reflectivity_model_record
+from assembler.workflow.builders import (
+    build_reflectivity_model_record,
+    build_reflectivity_records,
+    build_sample_record,
+)
+from assembler.workflow.builders.reflectivity import (
+    _parse_iso_timestamp,
+    _validate_reflectivity_data,
+)
+from assembler.workflow.builders.utils import determine_main_composition, new_record_id
 from assembler.writers import ParquetWriter
-from assembler.writers.parquet_writer import write_assembly_to_parquet
+from assembler.writers.parquet_writer import (
+    write_assemblies_to_parquet,
+    write_assembly_to_parquet,
+)
 
 
 class TestFileDetection:
@@ -60,16 +83,96 @@ class TestFileDetection:
         file_type = detect_file_type(model_file)
         assert file_type == FileType.MODEL
 
+    def test_detect_model_json_indicators(self, tmp_path):
+        """Model indicators are matched on the raw bytes of the file head."""
+        schema = tmp_path / "fit_218386.json"
+        schema.write_text('{"$schema": "BUMPS-draft-02", "object": {}}')
+        assert detect_file_type(schema) == FileType.MODEL
+
+        latin = tmp_path / "problem_218386.json"
+        latin.write_bytes(b'{"name": "caf\xe9", "module": "Refl1D"}')
+        assert detect_file_type(latin) == FileType.MODEL
+
+        other = tmp_path / "notes_218386.json"
+        other.write_text('{"comment": "sample without layers"}')
+        assert detect_file_type(other) == FileType.UNKNOWN
+
+    def test_detect_reduced_text_indicators(self, tmp_path):
+        """Two indicators are needed; the file name can supply both."""
+        assert detect_file_type(tmp_path / "REFL_218386_combined_data_auto.txt") == FileType.REDUCED
+
+        spaced = tmp_path / "run_218386.txt"
+        spaced.write_bytes(b"# IPTS-1\r\n# Q (1 / A)  R  dR  dQ\r\n0.01 1 0.1 0.001\r\n")
+        assert detect_file_type(spaced) == FileType.REDUCED
+
+        late = tmp_path / "notes_218386.txt"
+        late.write_text("".join(f"line {i}\n" for i in range(20)) + "# Experiment\n# Reduction\n")
+        assert detect_file_type(late) == FileType.UNKNOWN
+
+    def test_detect_unreadable_content_is_unknown(self, tmp_path):
+        """Content-sniffed types fall back to UNKNOWN when unreadable."""
+        assert detect_file_type(tmp_path / "missing_218386.json") == FileType.UNKNOWN
+        binary = tmp_path / "REFL_218386.txt"
+        binary.write_bytes(b"\xff\xfe\x00\x81" * 16)
+        assert detect_file_type(binary) == FileType.UNKNOWN
+
+    def test_detect_file_type_by_name(self):
+        """Extension-only classification defers JSON/TXT to content sniffing."""
+        assert detect_file_type_by_name("metadata_218386.parquet") == FileType.PARQUET
+        assert detect_file_type_by_name("REF_L_218386.nxs.h5") == FileType.RAW_HDF5
+        assert detect_file_type_by_name("REF_L_218386.HDF5") == FileType.RAW_HDF5
+        assert detect_file_type_by_name("notes_218386.log") == FileType.UNKNOWN
+        assert detect_file_type_by_name("model_218386.json") is None
+        assert detect_file_type_by_name("REFL_218386.txt") is None
+
+    def test_classify_by_name(self):
+        """Names decide the type when they can; otherwise content is needed."""
+        assert classify_by_name("REFL_218386_combined_data.txt") == (FileType.REDUCED, 218386)
+        assert classify_by_name("REF_L_218386_combined.txt") == (None, 218386)
+        assert classify_by_name("REFL_218386_notes.txt") == (None, 218386)
+        assert classify_by_name("daslogs_218386.parquet") == (FileType.PARQUET, 218386)
+        assert classify_by_name("notes_218386.txt") == (None, 218386)
+        assert classify_by_name("model_218386.json") == (None, 218386)
+        assert classify_by_name("README.md") == (FileType.UNKNOWN, None)
+
+    def test_detect_file_cache_tracks_file_changes(self, tmp_path):
+        """Cached detection is reused until the file changes."""
+        reduced_file = tmp_path / "run_218386.txt"
+        reduced_file.write_text("plain notes\n")
+
+        first = detect_file(reduced_file)
+        assert first.file_type == FileType.UNKNOWN
+        assert detect_file(reduced_file) is first
+
+        reduced_file.write_text("# Experiment IPTS-12345 Run 218386\n# Reduction 2.0\n")
+        second = detect_file(reduced_file)
+        assert second.file_type == FileType.REDUCED
+        assert second.ipts == "IPTS-12345"
+
+        clear_detection_cache()
+        assert detect_file(reduced_file) is not second
+
     def test_extract_run_number_various_formats(self):
         """Test run number extraction from various filename formats."""
         assert extract_run_number("REFL_218386_reduced.txt") == 218386
         assert extract_run_number("REF_L_218386.parquet") == 218386
         assert extract_run_number("model_218386.json") == 218386
+        assert extract_run_number("fit_12345_REFL_218386.txt") == 218386
+        # REFL_ outranks an earlier REF_L_, which outranks an earlier generic hit
+        assert extract_run_number("REF_L_218386refl_12345xa1234567_") == 12345
+        assert extract_run_number("fit_12345_REF_L_218386_REFL_218390.txt") == 218390
+        assert extract_run_number("fit_12345_REF_L_218386.txt") == 218386
+        assert extract_run_number("/data/run_218386_out/summary.txt") == 218386
+        assert extract_run_number("no_number.txt") is None
+        assert extract_run_number("/data/run_218386_out/v2.txt") == 218386
+        assert extract_run_number("/data/2024/notes.txt") is None
 
     def test_extract_ipts(self):
         """Test IPTS extraction from paths."""
         path = Path("/HFIR/CG1D/IPTS-12345/nexus/file.nxs")
         assert extract_ipts(path) == "IPTS-12345"
+        assert extract_ipts("/data/ipts-678/file.txt") == "IPTS-678"
+        assert extract_ipts("/data/file.txt", content="# Experiment IPTS 42") == "IPTS-42"
 
         path = Path("/data/IPTS-67890/reduced/file.txt")
         assert extract_ipts(path) == "IPTS-67890"
@@ -78,6 +181,201 @@ class TestFileDetection:
         assert extract_ipts(path) is None
 
 
+class TestFileFinder:
+    """Tests for locating related files across search paths."""
+
+    def _make_tree(self, root: Path) -> None:
+        reduced_dir = root / "reduced"
+        parquet_dir = root / "parquet" / "nested"
+        hidden_dir = root / ".cache"
+        for d in (reduced_dir, parquet_dir, hidden_dir):
+            d.mkdir(parents=True)
+        (reduced_dir / "REFL_218386_combined_data_auto.txt").write_text(
+            "# Experiment IPTS-12345 Run 218386\n# Reduction 2.0\n# Q [1/Angstrom]\n"
+            "0.01 1.0 0.01 0.001\n"
+        )
+        (reduced_dir / "REFL_218387_combined_data_auto.txt").write_text("# Reduction\n")
+        pq.write_table(pa.table({"run_number": [218386]}), parquet_dir / "metadata_218386.parquet")
+        pq.write_table(pa.table({"run_number": [218386]}), parquet_dir / "daslogs_218386.parquet")
+        (hidden_dir / "REFL_218386_stale.txt").write_text("# Reduction\n# Experiment\n")
+        model_dir = root / "fits"
+        model_dir.mkdir()
+        (model_dir / "model_218386.json").write_text('{"sample": {"layers": []}}')
+        (model_dir / "notes_218386.json").write_text('{"comment": "not a model"}')
+
+    def test_find_related_files(self, tmp_path):
+        """Files are located recursively and assigned to their slots."""
+        self._make_tree(tmp_path)
+        related = FileFinder([tmp_path]).find_related_files(218386)
+
+        assert related.reduced_file.endswith("REFL_218386_combined_data_auto.txt")
+        assert related.metadata_parquet.endswith("metadata_218386.parquet")
+        assert related.daslogs_parquet.endswith("daslogs_218386.parquet")
+        assert related.model_file.endswith("model_218386.json")
+        assert ".cache" not in related.reduced_file
+
+    def test_reduced_name_without_reduced_content_is_skipped(self, tmp_path):
+        """A REFL_ notes file next to the reduced data is not taken for it."""
+        self._make_tree(tmp_path)
+        notes = tmp_path / "reduced" / "REFL_218386_notes.txt"
+        notes.write_text("Sample was realigned before this run.\n")
+
+        assert detect_file(notes).file_type == FileType.UNKNOWN
+        related = FileFinder([tmp_path]).find_related_files(218386)
+        assert related.reduced_file.endswith("REFL_218386_combined_data_auto.txt")
+
+    def test_traversal_order_matches_rglob(self, tmp_path):
+        """When several files fit a slot, the first one rglob finds wins."""
+        for name in ("b", "d", "a", "e", "c"):
+            nested = tmp_path / name / "nested"
+            nested.mkdir(parents=True)
+            for directory in (nested.parent, nested):
+                (directory / "model_218386.json").write_text('{"sample": {"layers": []}}')
+
+        expected = next(p for p in tmp_path.rglob("*") if p.name == "model_218386.json")
+        related = FileFinder([tmp_path]).find_related_files(218386)
+        assert related.model_file == str(expected)
+
+    def test_find_related_files_non_recursive(self, tmp_path):
+        """Non-recursive search only looks at the top level of each path."""
+        self._make_tree(tmp_path)
+        related = FileFinder([tmp_path / "reduced", tmp_path / "parquet"]).find_related_files(
+            218386, recursive=False
+        )
+
+        assert related.reduced_file is not None
+        assert related.metadata_parquet is None
+
+    def test_only_data_files_naming_the_run_are_considered(self, tmp_path):
+        """Other extensions and other runs are ignored; extension case is not."""
+        reduced = "# Experiment IPTS-12345 Run 218386\n# Reduction 2.0\n0.01 1.0 0.01 0.001\n"
+        (tmp_path / "REFL_218386.log").write_text(reduced)
+        (tmp_path / "REFL_999.txt").write_text(reduced)
+        (tmp_path / "model_218386.JSON").write_text('{"sample": {"layers": []}}')
+
+        related = FileFinder([tmp_path]).find_related_files(218386)
+        assert related.reduced_file is None
+        assert related.model_file == str(tmp_path / "model_218386.JSON")
+
+    def test_find_related_files_batch(self, tmp_path):
+        """Several runs are resolved from a single walk."""
+        self._make_tree(tmp_path)
+        related = FileFinder([tmp_path]).find_related_files_batch([218386, 218387, 218388])
+
+        assert set(related) == {218386, 218387, 218388}
+        assert related[218386].metadata_parquet.endswith("metadata_218386.parquet")
+        assert related[218387].reduced_file.endswith("REFL_218387_combined_data_auto.txt")
+        assert related[218387].metadata_parquet is None
+        assert related[218388].available_files() == []
+
+    def test_directory_listings_are_cached(self, tmp_path, monkeypatch):
+        """Unchanged directories are not listed again; changed ones are."""
+        self._make_tree(tmp_path)
+        finder = FileFinder([tmp_path])
+        assert finder.find_related_files(218386).model_file is not None
+
+        listed = []
+        scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda p: listed.append(p) or scandir(p))
+
+        assert finder.find_related_files(218387).reduced_file is not None
+        assert listed == []
+
+        (tmp_path / "fits" / "model_218387.json").write_text('{"sample": {"layers": []}}')
+        assert finder.find_related_files(218387).model_file.endswith("model_218387.json")
+        assert listed == [str(tmp_path / "fits")]
+
+        finder.invalidate_cache(tmp_path / "parquet")
+        finder.find_related_files(218387)
+        parquet_dir = tmp_path / "parquet"
+        assert sorted(listed[1:]) == [str(parquet_dir), str(parquet_dir / "nested")]
+
+        listed.clear()
+        finder.invalidate_cache()
+        finder.find_related_files(218387)
+        assert {str(tmp_path), str(tmp_path / "reduced"), str(tmp_path / "fits")} <= set(listed)
+
+    def test_file_rewritten_in_place_is_redetected(self, tmp_path):
+        """Cached listings don't hide content changes to an existing file."""
+        reduced_file = tmp_path / "run_218386.txt"
+        reduced_file.write_text("plain notes\n")
+        finder = FileFinder([tmp_path])
+        assert finder.find_related_files(218386).reduced_file is None
+
+        reduced_file.write_text("# Experiment IPTS-12345 Run 218386\n# Reduction 2.0\n")
+        assert finder.find_related_files(218386).reduced_file == str(reduced_file)
+
+    def test_directory_cache_is_bounded(self, tmp_path, monkeypatch):
+        """The oldest listings are dropped once the cache is full."""
+        monkeypatch.setattr("assembler.tools.finder._DIR_CACHE_MAX", 2)
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+        finder = FileFinder([tmp_path])
+        finder.find_related_files(218386)
+
+        listed = []
+        scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda p: listed.append(p) or scandir(p))
+        finder.find_related_files(218386)
+        assert str(tmp_path) in listed
+
+    def test_concurrent_scans_with_full_cache(self, tmp_path, monkeypatch):
+        """Worker threads evicting from a full cache don't trip over each other."""
+        monkeypatch.setattr("assembler.tools.finder._DIR_CACHE_MAX", 4)
+        roots = []
+        for i in range(8):
+            root = tmp_path / f"root{i}"
+            for j in range(10):
+                (root / f"sub{j}").mkdir(parents=True)
+            (root / f"sub{i}" / f"model_21838{i}.json").write_text('{"sample": {"layers": []}}')
+            roots.append(root)
+        finder = FileFinder(roots)
+        runs = [218380 + i for i in range(8)]
+
+        def scan(_):
+            finder.invalidate_cache(roots[0])
+            return finder.find_related_files_batch(runs)
+
+        # Switch threads as often as possible so evictions interleave
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(scan, range(50)))
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        for related in results:
+            for i, run in enumerate(runs):
+                assert related[run].model_file.endswith(f"sub{i}/model_{run}.json")
+
+    def test_parquet_slots(self, tmp_path):
+        """Parquet names map to slots by keyword, in priority order."""
+        paths = []
+        for i, name in enumerate((
+            "sample_metadata_218386.parquet",
+            "SAMPLE_218386.parquet",
+            "users_218386.parquet",
+            "metadata_218386.parquet",
+            "extra_218386.parquet",
+        )):
+            # One search path per file so the first match for a slot is known
+            search_path = tmp_path / f"p{i}"
+            search_path.mkdir()
+            pq.write_table(pa.table({"run_number": [218386]}), search_path / name)
+            paths.append(str(search_path / name))
+
+        related = FileFinder([tmp_path / f"p{i}" for i in range(5)]).find_related_files(218386)
+        assert related.metadata_parquet == paths[0]
+        assert related.sample_parquet == paths[1]
+        assert related.users_parquet == paths[2]
+        assert related.other_parquet == [paths[4]]
+
+    def test_missing_search_path_is_ignored(self, tmp_path):
+        related = FileFinder([tmp_path / "missing"]).find_related_files(218386)
+        assert related.available_files() == []
+
+
 class TestDataAssembler:
     """Tests for the DataAssembler workflow."""
 
@@ -165,6 +463,52 @@ class TestDataAssembler:
         )
 
         assert result.sample is not None
+        assert result.sample["substrate"]["material"]["name"] == "Si"
+        assert [layer["name"] for layer in result.sample["layers"]] == ["Gold"]
+        assert result.sample["main_composition"] == "Au"
+        assert result.sample["description"] == "Au in air on Si"
+
+    def test_main_composition_is_thickest_layer(self):
+        layers = [
+            {"thickness": None, "material": {"name": "Air"}},
+            {"thickness": 50.0, "material": {"name": "Cu"}},
+            {"thickness": 120.0, "material": {"name": "Ti"}},
+            {"thickness": 120.0, "material": {"name": "Au"}},
+        ]
+        assert determine_main_composition(layers) == "Ti"
+        assert determine_main_composition(layers[:1]) == "Unknown"
+        assert determine_main_composition([{"thickness": 5.0, "material": None}]) == "Unknown"
+
+    def test_sample_main_composition_is_thickest_layer(self):
+        """The first of the thickest film layers names the composition."""
+        layers = [
+            ModelLayer(name, thickness, interface=1.0, material=ModelMaterial(name, rho=1.0))
+            for name, thickness in (("Air", 0.0), ("Cu", 50.0), ("Ti", 120.0), ("Au", 120.0))
+        ]
+
+        sample = build_sample_record(ModelData(file_path="", layers=layers), [], [], {})
+        assert sample["main_composition"] == "Ti"
+
+        sample = build_sample_record(ModelData(file_path="", layers=layers[:1]), [], [], {})
+        assert sample["main_composition"] == "Unknown"
+
+    def test_generic_layer_names_need_review(self):
+        """Layers named only 'film', 'layer', etc. are flagged for review."""
+        copper = ModelMaterial(name="Cu", rho=6.5)
+        model_data = ModelData(
+            file_path="/tmp/model.json",
+            layers=[
+                ModelLayer(name="Film", thickness=50.0, interface=1.0, material=copper),
+                ModelLayer(name="Copper", thickness=20.0, interface=1.0, material=copper),
+            ],
+        )
+        result = DataAssembler().assemble(
+            reduced=ReducedData(file_path="/tmp/test.txt", q=[0.01], r=[1.0]),
+            model=model_data,
+        )
+
+        assert "layer_0_name" in result.needs_review
+        assert "layer_1_name" not in result.needs_review
 
     def test_assemble_without_parquet_uses_meta_block(self):
         """No-parquet ingest of the fixture file populates everything except raw_file_path."""
@@ -252,6 +596,155 @@ class TestDataAssembler:
         assert result.environment is not None
         assert result.environment["temperature"] == 298.0
 
+    def test_bulk_reflectivity_builder_shares_created_at(self):
+        metadata = MetadataRecord(
+            instrument_id="REF_L",
+            run_number=218386,
+            run_id="REF_L_218386",
+            title="t",
+            start_time="2024-01-15T00:00:00Z",
+            experiment_identifier="IPTS-1",
+        )
+        items = [
+            (ReducedData(file_path="/tmp/b.txt", run_number=218387, q=[0.01], r=[1.0]), None),
+            (ReducedData(file_path="/tmp/a.txt", q=[0.01], r=[1.0]), ParquetData(metadata)),
+        ]
+        warnings, errors, needs_review = [], [], {}
+
+        refls = build_reflectivity_records(items, warnings, errors, needs_review)
+
+        assert not errors
+        assert [r["run_number"] for r in refls] == ["218387", "218386"]
+        assert refls[1]["proposal_number"] == "IPTS-1"
+        assert len({r["created_at"] for r in refls}) == 1
+
+    def test_new_record_id_is_unique_uuid4(self):
+        # Draw past the end of one entropy block
+        ids = [new_record_id() for _ in range(600)]
+
+        assert len(set(ids)) == len(ids)
+        for record_id in ids:
+            parsed = uuid.UUID(record_id)
+            assert str(parsed) == record_id
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+
+    def test_assemble_records_share_created_at(self):
+        reduced_data = ReducedData(file_path="/tmp/test.txt", q=[0.01], r=[1.0])
+        model_data = ModelData(
+            file_path="/tmp/model.json",
+            layers=[
+                ModelLayer(
+                    name="Cu",
+                    thickness=50.0,
+                    interface=5.0,
+                    material=ModelMaterial(name="Cu", rho=6.5),
+                ),
+            ],
+        )
+
+        result = DataAssembler().assemble(
+            reduced=reduced_data, model=model_data, environment_description="D2O"
+        )
+
+        created = {
+            record["created_at"]
+            for record in (result.reflectivity, result.environment, result.sample)
+        }
+        assert len(created) == 1
+
+    @staticmethod
+    def _corefinement_model(*probes):
+        models = [{"probe": {"Q": {"values": q}, "R": {"values": r}}} for q, r in probes]
+        return ModelData(file_path="/tmp/model.json", raw_json={"object": {"models": models}})
+
+    def test_auto_detect_dataset_matches_reflectivity(self):
+        """The experiment whose model R tracks the reduced data is selected."""
+        q = [0.01 * i for i in range(1, 21)]
+        r = [1.0 / i**4 for i in range(1, 21)]
+        reduced = ReducedData(file_path="/tmp/test.txt", q=q, r=r)
+        model = self._corefinement_model(
+            (q, [10 * v for v in r]),
+            # Descending probe grid, same curve as the reduced data
+            (q[::-1], r[::-1]),
+        )
+
+        assert DataAssembler._auto_detect_dataset(model, reduced) == 1
+
+    def test_auto_detect_dataset_ignores_nonpositive_r(self):
+        """Zero/negative reduced R points do not swamp the log-space score."""
+        q = [0.01 * i for i in range(1, 21)]
+        r = [1.0 / i**4 for i in range(1, 21)]
+        model = self._corefinement_model((q, [2 * v for v in r]), (q, r))
+        noisy = r[:-2] + [0.0, -1e-9]
+        reduced = ReducedData(file_path="/tmp/test.txt", q=q, r=noisy)
+
+        assert DataAssembler._auto_detect_dataset(model, reduced) == 1
+
+    def test_auto_detect_dataset_rejects_loose_r_match(self):
+        """Model R more than ~10% off the data is not taken as a match."""
+        q = [0.01 * i for i in range(1, 21)]
+        r = [1.0 / i**4 for i in range(1, 21)]
+        reduced = ReducedData(file_path="/tmp/test.txt", q=q, r=r)
+
+        close = self._corefinement_model((q, [1.05 * v for v in r]))
+        assert DataAssembler._auto_detect_dataset(close, reduced) == 0
+
+        loose = self._corefinement_model((q, [1.3 * v for v in r]))
+        assert DataAssembler._auto_detect_dataset(loose, reduced) is None
+
+    def test_auto_detect_dataset_falls_back_to_q_range(self):
+        """Without a usable R comparison, Q-range agreement decides."""
+        reduced = ReducedData(file_path="/tmp/test.txt", q=[0.01, 0.05, 0.1])
+        model = self._corefinement_model(
+            ([0.2, 0.3], [1.0, 1.0]),
+            ([0.0101, 0.1], [1.0, 1.0]),
+        )
+        assert DataAssembler._auto_detect_dataset(model, reduced) == 1
+
+        far = self._corefinement_model(([0.5, 0.9], [1.0, 1.0]), ([], []))
+        assert DataAssembler._auto_detect_dataset(far, reduced) is None
+
+
+class TestReflectivityValidation:
+    """Tests for the reflectivity data sanity checks."""
+
+    def _record(self, q):
+        n = len(q)
+        return {"q": q, "r": [1.0] * n, "dr": [0.1] * n, "dq": [0.001] * n}
+
+    def test_small_q_range_warns(self):
+        warnings = _validate_reflectivity_data(self._record([0.0009 * i for i in range(1, 11)]))
+        assert any("Q range very small" in w for w in warnings)
+
+    def test_large_q_range_checked(self):
+        q = [0.0001 + 0.00001 * i for i in range(500)]
+        warnings = _validate_reflectivity_data(self._record(q))
+        assert warnings == ["Q range very small: 0.0001 - 0.0051 Å⁻¹"]
+        assert _validate_reflectivity_data(self._record(np.array(q))) == warnings
+
+        q = [0.01 + 0.0002 * i for i in range(500)]
+        assert _validate_reflectivity_data(self._record(q)) == []
+
+    def test_length_mismatch_and_array_columns(self):
+        record = self._record(np.linspace(0.01, 0.1, 20))
+        record["dq"] = None
+        warnings = _validate_reflectivity_data(record)
+        assert warnings == ["Array length mismatch: q=20, r=20, dr=20, dq=0"]
+
+    def test_parse_iso_timestamp(self):
+        parsed = _parse_iso_timestamp("2024-01-15T10:30:00Z")
+        assert parsed == datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+        parsed = _parse_iso_timestamp("2024-01-15T10:30:00.250000Z")
+        assert parsed == datetime(2024, 1, 15, 10, 30, 0, 250000, tzinfo=timezone.utc)
+        assert _parse_iso_timestamp("20240115T103000") == datetime(2024, 1, 15, 10, 30)
+        for bad in (None, 1705312200, "", "yesterday", "2024-13-01"):
+            assert _parse_iso_timestamp(bad) is None
+
+    def test_empty_arrays_skip_range_check(self):
+        warnings = _validate_reflectivity_data(self._record(np.array([])))
+        assert warnings == ["Only 0 data points - unusually small dataset"]
+
 
 class TestParquetWriter:
     """Tests for Parquet output writing."""
@@ -412,6 +905,17 @@ class TestParquetWriter:
             assert "facility=SNS" in path_str
             assert "year=2024" in path_str
 
+    def test_writers_do_not_import_the_assembler(self):
+        """Importing a writer must not pull in the workflow package."""
+        code = (
+            "import sys, assembler.writers.json_writer; "
+            "print('assembler.workflow.assembler' in sys.modules)"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert out.stdout.strip() == "False"
+
 
 class TestIntegration:
     """Integration tests for the full workflow."""
@@ -485,6 +989,50 @@ class TestIntegration:
                 table = pf.read()
                 assert table.num_rows == 1
 
+    def test_write_assemblies_one_file_per_table(self, tmp_path):
+        """Batched output gathers every run of a partition into one file."""
+        copper = ModelMaterial(name="Cu", rho=6.5)
+        results = []
+        runs = {
+            218386: "2024-01-15T00:00:00Z",
+            218387: "2024-02-01T00:00:00Z",
+            218388: "2025-03-01T00:00:00Z",
+        }
+        for run, start in runs.items():
+            parquet_data = ParquetData(
+                metadata=MetadataRecord(
+                    instrument_id="REF_L",
+                    run_number=run,
+                    run_id=f"REF_L_{run}",
+                    title="t",
+                    start_time=start,
+                    experiment_identifier="IPTS-1",
+                ),
+            )
+            model_data = ModelData(
+                file_path="/tmp/model.json",
+                layers=[ModelLayer(name="Cu", thickness=50.0, interface=1.0, material=copper)],
+            )
+            reduced = ReducedData(file_path="/tmp/test.txt", q=[0.01, 0.02], r=[1.0, 0.8])
+            results.append(
+                DataAssembler().assemble(reduced=reduced, parquet=parquet_data, model=model_data)
+            )
+
+        paths = write_assemblies_to_parquet(results, tmp_path)
+        again = write_assemblies_to_parquet(results[:1], tmp_path)
+
+        rows = {
+            path.parent.name: pq.read_table(str(path), columns=["run_number"])["run_number"]
+            .to_pylist()
+            for path in paths["reflectivity"]
+        }
+        assert rows == {"year=2024": ["218386", "218387"], "year=2025": ["218388"]}
+        assert [pq.ParquetFile(str(p)).metadata.num_rows for p in paths["sample"]] == [3]
+        assert [pq.ParquetFile(str(p)).metadata.num_rows for p in paths["environment"]] == [3]
+        assert "reflectivity_model" not in paths
+        assert again["sample"][0] != paths["sample"][0]
+        assert paths["sample"][0].exists()
+
 
 class TestAssembleWorkflow:
     """Pull-based ingestion from a standard refl1d/AuRE workflow run directory."""
@@ -787,6 +1335,28 @@ class TestFitRecord:
         assert len(rec["datasets"]) == 1
         assert rec["datasets"][0]["measurement_id"] == "run-a"
 
+    def test_model_json_is_normalized_serialization(self, tmp_path):
+        """model_json doesn't depend on how the model file was formatted."""
+        raw = self._model(num_experiments=1).raw_json
+        compact = tmp_path / "compact.json"
+        compact.write_text(json.dumps(raw))
+        indented = tmp_path / "indented.json"
+        indented.write_text(json.dumps(raw, indent=4))
+
+        records = [
+            build_reflectivity_model_record(ModelParser().parse(path), ["run-a"], [], [], {})
+            for path in (compact, indented)
+        ]
+        assert records[0]["model_json"] == records[1]["model_json"] == json.dumps(raw)
+
+    def test_model_json_can_be_omitted(self):
+        reduced = ReducedData(file_path="/tmp/test.txt", q=[0.01], r=[1.0])
+        result = DataAssembler(include_model_json=False).assemble(
+            reduced=reduced, model=self._model(num_experiments=1)
+        )
+        assert result.reflectivity_model is not None
+        assert result.reflectivity_model["model_json"] is None
+
     def test_fit_record_round_trips_through_parquet(self, tmp_path):
         """The nested datasets[] struct must validate against the schema."""
         model = self._model(num_experiments=2)